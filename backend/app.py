@@ -3,20 +3,22 @@ import string
 import random
 import logging
 from logging.config import dictConfig
+from typing import AsyncIterator
 from fastapi import FastAPI
 from fastapi import Request
 from fastapi import Depends
 from fastapi import Request, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import PlainTextResponse
 from fastapi.utils import generate_unique_id
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.sessions import SessionMiddleware
-from .dependencies import get_query_token, custom_generate_unique_id
+from .dependencies import get_query_token, get_token_header, custom_generate_unique_id
+from .middlewares import CompressionMiddleware
+from .instrumentation import RequestMetrics, request_metrics
 from .config import settings
 
 
@@ -56,10 +58,14 @@ def create_app():
         redoc_url='/api/v1/redoc',
     )
 
-    # Mount the static folder to the app for use in Jinja2 template.
+    # Mount the static folder to the app for use in Jinja2 template. The static files
+    # are served from the build directory with the fingerprinted names, that the
+    # `url_for` function of templates resolves from the asset manifest.
     # usages: `{{ url_for('static', path='/styles.css') }}`
     # docs: https://fastapi.tiangolo.com/advanced/templates/
-    app.mount("/static", StaticFiles(directory="backend/static"), name="static")
+    from .assets import manifest, ImmutableStaticFiles
+    manifest.build()
+    app.mount("/static", ImmutableStaticFiles(manifest=manifest), name="static")
 
     # Add CORS (Cross-Origin Resource Sharing) middleware to the app.
     # ---
@@ -91,28 +97,74 @@ def create_app():
         https_only=False,
     )
 
+    # Compress the responses with gzip, the streaming responses are compressed chunk
+    # by chunk and the precompressed static files pass through as is.
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        content_types=settings.COMPRESSION_CONTENT_TYPES,
+        compresslevel=settings.COMPRESSION_LEVEL,
+    )
+
     # Middleware that logs the time every request takes.
     # docs: https://philstories.medium.com/fastapi-logging-f6237b84ea64
     @app.middleware('http')
     async def log_requests(request: Request, call_next):
         idem = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
         logger.info(f"rid={idem} start request path={request.url.path}")
+
+        # The SQL hooks of the engines add to the metrics of this request, also
+        # while the streaming response body is sent after this middleware returns.
+        metrics = RequestMetrics()
+        token = request_metrics.set(metrics)
         start_time = time.time()
-        response = await call_next(request)
-        process_time = (time.time() - start_time) * 1000
-        formatted_process_time = '{0:.2f}'.format(process_time)
-        logger.info(f"rid={idem} completed_in={formatted_process_time}ms status_code={response.status_code}")
-        print(f"rid={idem} completed_in={formatted_process_time}ms status_code={response.status_code}")
+        try:
+            response = await call_next(request)
+        finally:
+            request_metrics.reset(token)
+        if settings.SERVER_TIMING_ENABLED:
+            # The header covers the work before the response starts.
+            response.headers["Server-Timing"] = metrics.server_timing((time.time() - start_time) * 1000)
+
+        def log_completed() -> None:
+            process_time = (time.time() - start_time) * 1000
+            formatted_process_time = '{0:.2f}'.format(process_time)
+            formatted_sql = f"sql_count={metrics.statements} sql_time={metrics.sql_time * 1000:.2f}ms"
+            logger.info(
+                f"rid={idem} completed_in={formatted_process_time}ms {formatted_sql} "
+                f"status_code={response.status_code}"
+            )
+            print(
+                f"rid={idem} completed_in={formatted_process_time}ms {formatted_sql} "
+                f"status_code={response.status_code}"
+            )
+            if settings.SQL_N_PLUS_ONE_THRESHOLD:
+                for statement, count in metrics.repeated(settings.SQL_N_PLUS_ONE_THRESHOLD):
+                    logger.warning(
+                        f"rid={idem} N+1 query suspected path={request.url.path} "
+                        f"count={count} statement={statement!r}"
+                    )
+
+        async def body_completed(body: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+            try:
+                async for chunk in body:
+                    yield chunk
+            finally:
+                log_completed()
+
+        # Log the request when its body is sent, so the line includes the SQL and
+        # the template render of the streaming response.
+        response.body_iterator = body_completed(response.body_iterator)
         return response
 
-    # Add internal routers to the app like admin
-    # app.include_router(
-    #     admin,
-    #     prefix="/admin",
-    #     tags=["admin"],
-    #     dependencies=[Depends(get_token_header)],
-    #     responses={418: {"description": "I'm a teapot"}},
-    # )
+    # Add internal routers to the app like admin, that take the internal token of
+    # the `X-Token` header.
+    from .internal import admin
+    app.include_router(
+        admin,
+        prefix=f'/api/v{settings.APP_VERSION}',
+        dependencies=[Depends(get_token_header)],
+    )
 
     # Add routers to the application
     from .routers import api_router
@@ -136,23 +188,67 @@ def create_app():
     @app.on_event("startup")
     async def startup():
         """Handlers event before app start-up"""
-        from .database import async_engine
-        from .database import Base
+        from starlette.concurrency import run_in_threadpool
+        from .database import engine, async_engine, async_read_engine
+        from .database import verify_sqlite_pragmas
+        from .migrations import migrate
+        from .pools import prewarm, prewarm_async
+        from .templating import get_template_engine, get_email_templates
+        from .utils.mailer import mail_queue
 
         print("Start starting up event ... ")
-        # Drop and Create tables in database without async
-        async with async_engine.begin() as conn:
-            await conn.run_sync(Base.metadata.drop_all)
-            await conn.run_sync(Base.metadata.create_all)
+        await mail_queue.start()
+        # Compile all templates before the first request reach this worker.
+        get_template_engine().precompile()
+        get_email_templates().precompile()
+
+        # Check that both engines open their connections with the SQLite profile.
+        if async_engine.dialect.name == "sqlite":
+            async with async_engine.connect() as conn:
+                await conn.run_sync(verify_sqlite_pragmas)
+
+            def verify_sync_engine():
+                with engine.connect() as conn:
+                    return verify_sqlite_pragmas(conn)
+
+            logger.info(f"SQLite pragmas: {await run_in_threadpool(verify_sync_engine)}")
+
+        # Apply the pending schema revisions, that is a no-op on the current schema.
+        current = await run_in_threadpool(migrate, engine)
+        logger.info(f"schema revision: {current}")
+
+        # The read-only engine can open the SQLite file only after it is created.
+        if async_read_engine.dialect.name == "sqlite":
+            async with async_read_engine.connect() as conn:
+                await conn.run_sync(verify_sqlite_pragmas)
+
+        if settings.SQLALCHEMY_POOL_PREWARM:
+            await run_in_threadpool(prewarm, engine, settings.SQLALCHEMY_POOL_SIZE)
+            await prewarm_async(async_engine, settings.SQLALCHEMY_POOL_SIZE)
+            await prewarm_async(async_read_engine, settings.SQLALCHEMY_READ_POOL_SIZE)
 
     @app.on_event("shutdown")
-    def shutdown_event():
+    async def shutdown_event():
         """Handlers event before app shutting-down"""
+        from .securities import password_service
+        from .utils.mailer import mail_queue
+        from .database import async_engine, async_read_engine
+
         print("Start shutting down event ... ")
+        await mail_queue.stop()
+        password_service.shutdown()
+
+        # Close the pooled connections of both async engines.
+        await async_engine.dispose()
+        await async_read_engine.dispose()
 
     @app.exception_handler(StarletteHTTPException)
     async def http_exception_handler(request: Request, exc: StarletteHTTPException):
-        return PlainTextResponse(str(exc.detail), status_code=exc.status_code)
+        return PlainTextResponse(
+            str(exc.detail),
+            status_code=exc.status_code,
+            headers=getattr(exc, "headers", None),
+        )
 
     # RequestValidationError is a sub-class of Pydantic's ValidationError
     # docs: https://fastapi.tiangolo.com/tutorial/handling-errors/
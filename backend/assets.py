@@ -0,0 +1,181 @@
+"""Static asset pipeline. It copies the files of the static directory to the build
+directory with the content hash in their names, generates the gzip variants of
+them ahead of time, and serves the hashed names with the immutable cache policy.
+
+usages:
+
+    ..> $ python -m backend.assets vendor     # Update the vendored assets
+    ..> $ python -m backend.assets build      # Build the static directory
+
+"""
+import base64
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import sys
+import tempfile
+import urllib.request
+from pathlib import Path
+from typing import Dict, Union
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Scope
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# The third-party assets that are committed to the static directory and served
+# instead of CDN. The `vendor` command only updates them after the version bump,
+# and verifies the download with the Subresource Integrity hash of the file.
+# docs: https://developer.mozilla.org/en-US/docs/Web/Security/Subresource_Integrity
+VENDORED_ASSETS: Dict[str, dict] = {
+    "js/htmx.min.js": {
+        "url": "https://unpkg.com/htmx.org@1.8.6/dist/htmx.min.js",
+        "integrity": "sha384-Bj8qm/6B+71E6FQSySofJOUjA/gq330vEqjFx9LakWybUySyI1IQHwPtbTU7bNwx",
+    },
+}
+
+COMPRESSIBLE_SUFFIXES: set = {".css", ".js", ".json", ".map", ".svg", ".txt", ".html"}
+
+IMMUTABLE_CACHE_CONTROL: str = "public, max-age=31536000, immutable"
+
+
+def vendor(directory: Union[str, Path]) -> None:
+    """Download the vendored assets to the static directory and verify them with
+    their integrity hash.
+    """
+    for path, asset in VENDORED_ASSETS.items():
+        with urllib.request.urlopen(asset["url"]) as response:
+            content: bytes = response.read()
+        algorithm, expected = asset["integrity"].split("-", 1)
+        digest = base64.b64encode(hashlib.new(algorithm, content).digest()).decode()
+        if digest != expected:
+            raise ValueError(f"integrity of {asset['url']} does not match: {algorithm}-{digest}")
+        target = Path(directory) / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+        logger.info(f"vendored {asset['url']} to {target}")
+
+
+def _write(target: Path, content: bytes) -> None:
+    """Write the file atomically, because every worker builds the same directory,
+    and keep the unchanged file with its modified time for the validators.
+    """
+    if target.exists() and target.read_bytes() == content:
+        return
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+    with os.fdopen(fd, "wb") as f:
+        f.write(content)
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, target)
+
+
+class AssetManifest:
+    """Mapping of the logical static paths to their fingerprinted paths.
+
+    usages:
+
+        ..> manifest = AssetManifest('backend/static', '.cache/static')
+        ... manifest.build()
+        ... manifest.resolve('css/base.css')
+        'css/base.0c4a3bd8e5f1.css'
+
+    """
+
+    def __init__(self, source: Union[str, Path], target: Union[str, Path]) -> None:
+        self.source: Path = Path(source)
+        self.target: Path = Path(target)
+        self.paths: Dict[str, str] = {}
+        self.hashed: set = set()
+
+    def build(self) -> Dict[str, str]:
+        paths: Dict[str, str] = {}
+        for file in sorted(self.source.rglob("*")):
+            if not file.is_file() or file.name.startswith("."):
+                continue
+            path = file.relative_to(self.source).as_posix()
+            content = file.read_bytes()
+            digest = hashlib.sha256(content).hexdigest()[:12]
+            hashed = Path(path).with_name(f"{file.stem}.{digest}{file.suffix}").as_posix()
+
+            # Keep the original name for the references that do not use `url_for`,
+            # like the `url()` in stylesheets.
+            for name in (path, hashed):
+                _write(self.target / name, content)
+                if file.suffix in COMPRESSIBLE_SUFFIXES:
+                    compressed = gzip.compress(content, compresslevel=9, mtime=0)
+                    if len(compressed) < len(content):
+                        _write(self.target / f"{name}.gz", compressed)
+            paths[path] = hashed
+        self.paths = paths
+        self.hashed = set(paths.values())
+        logger.info(f"built {len(paths)} static assets to {self.target}")
+        return paths
+
+    def resolve(self, path: str) -> str:
+        """Return the fingerprinted path of the static file"""
+        return self.paths.get(path.lstrip("/"), path)
+
+    def is_immutable(self, path: str) -> bool:
+        return path.lstrip("/") in self.hashed
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """Static files application that serves the precompressed variant of the file
+    if the client accepts it, and adds the immutable cache policy to the
+    fingerprinted files.
+    """
+
+    def __init__(self, *, manifest: AssetManifest, **kwargs) -> None:
+        super().__init__(directory=manifest.target, **kwargs)
+        self.manifest: AssetManifest = manifest
+
+    def file_response(
+            self,
+            full_path: Union[str, "os.PathLike[str]"],
+            stat_result: os.stat_result,
+            scope: Scope,
+            status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        compressed_path = f"{full_path}.gz"
+        if (
+                "gzip" in request_headers.get("accept-encoding", "")
+                and os.path.isfile(compressed_path)
+        ):
+            response = FileResponse(
+                compressed_path,
+                status_code=status_code,
+                stat_result=os.stat(compressed_path),
+                method=scope["method"],
+                media_type=mimetypes.guess_type(str(full_path))[0],
+                headers={"Content-Encoding": "gzip"},
+            )
+            if self.is_not_modified(response.headers, request_headers):
+                response = NotModifiedResponse(response.headers)
+        else:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+
+        path = Path(os.path.relpath(full_path, os.path.realpath(self.manifest.target))).as_posix()
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = (
+            IMMUTABLE_CACHE_CONTROL if self.manifest.is_immutable(path) else "no-cache"
+        )
+        return response
+
+
+manifest: AssetManifest = AssetManifest(settings.STATIC_DIR, settings.STATIC_BUILD_DIR)
+
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else "build"
+    if command == "vendor":
+        vendor(settings.STATIC_DIR)
+    manifest.build()
+    for name, hashed in manifest.paths.items():
+        print(f"{name} -> {hashed}")
@@ -0,0 +1,53 @@
+from typing import Any, Generic, List, Optional, Tuple, Type, TypeVar
+from fastapi import HTTPException, status
+from pydantic import BaseModel, ValidationError
+from pydantic.generics import GenericModel
+from .config import settings
+
+ItemType = TypeVar("ItemType")
+ModelType = TypeVar("ModelType", bound=BaseModel)
+
+
+class BulkItem(GenericModel, Generic[ItemType]):
+    """Result of one item of the bulk request by its index in the request body"""
+    index: int
+    status: int
+    item: Optional[ItemType] = None
+    errors: Optional[List[Any]] = None
+
+
+class BulkResult(GenericModel, Generic[ItemType]):
+    created: int
+    results: List[BulkItem[ItemType]]
+
+
+def validate_items(
+        model: Type[ModelType],
+        items: List[Any],
+) -> Tuple[List[Tuple[int, ModelType]], List[BulkItem]]:
+    """Validate every item of the bulk request on its own, and return the valid
+    items with their indexes, and the results of the invalid items. The invalid
+    item does not fail the whole batch.
+    """
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"The bulk request takes at most {settings.BULK_MAX_ITEMS} items",
+        )
+    valid: List[Tuple[int, ModelType]] = []
+    failed: List[BulkItem] = []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, model.parse_obj(item)))
+        except ValidationError as err:
+            failed.append(
+                BulkItem(index=index, status=status.HTTP_422_UNPROCESSABLE_ENTITY, errors=err.errors())
+            )
+    return valid, failed
+
+
+def bulk_result(results: List[BulkItem]) -> BulkResult:
+    return BulkResult(
+        created=sum(result.status == status.HTTP_201_CREATED for result in results),
+        results=sorted(results, key=lambda result: result.index),
+    )
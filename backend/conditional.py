@@ -0,0 +1,86 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+from fastapi import Request, Response, status
+
+
+@dataclass(frozen=True)
+class Validator:
+    """Cache validator of the resource for the conditional request.
+    docs: https://developer.mozilla.org/en-US/docs/Web/HTTP/Conditional_requests
+
+    usages:
+
+        ..> Validator.build(count, last_id, last_update, last_modified=last_update)
+
+    """
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    @classmethod
+    def build(cls, *parts: Any, last_modified: Optional[datetime] = None) -> 'Validator':
+        """Build the weak validator from the cheap values that change when the
+        resource changes, like the row count and the max `update_at` value.
+        """
+        digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+        if last_modified is not None:
+            # The naive datetime values in the database are the local time.
+            last_modified = last_modified.astimezone(timezone.utc).replace(microsecond=0)
+        return cls(etag=f'W/"{digest}"', last_modified=last_modified)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def apply(self, response: Response) -> Response:
+        response.headers.update(self.headers)
+        return response
+
+
+class ConditionalRequest:
+    """Dependency that answers the conditional GET request before the handler
+    serializes or renders the resource.
+
+    implemented:
+
+        ..> @router.get('...')
+        ... async def read(conditional: ConditionalRequest = Depends(ConditionalRequest)):
+        ...     validator = await service.version()
+        ...     if response := conditional.evaluate(validator):
+        ...         return response
+        ...     return validator.apply(...)
+
+    """
+
+    def __init__(self, request: Request) -> None:
+        self.request = request
+
+    def is_fresh(self, validator: Validator) -> bool:
+        """Return True if the client already has the current version of resource"""
+        # The `If-None-Match` header takes precedence over `If-Modified-Since`.
+        # docs: https://www.rfc-editor.org/rfc/rfc9110#section-13.2.2
+        if (if_none_match := self.request.headers.get("if-none-match")) is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or validator.etag.removeprefix("W/") in tags
+        if (
+                (if_modified_since := self.request.headers.get("if-modified-since"))
+                and validator.last_modified is not None
+        ):
+            try:
+                return validator.last_modified <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def evaluate(self, validator: Validator) -> Optional[Response]:
+        """Return the `304 Not Modified` response if the client has the current
+        version of resource, otherwise return None.
+        """
+        if self.request.method in {"GET", "HEAD"} and self.is_fresh(validator):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator.headers)
+        return None
@@ -117,6 +117,33 @@ class BaseConfig:
     # Security Configuration
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    TOKEN_CACHE_SIZE: int = 4096
+
+    # The token of the `X-Token` header of the internal endpoints, like the stats
+    # of the worker. The internal endpoints are disabled if it is not set.
+    INTERNAL_TOKEN: Optional[str] = os.environ.get("INTERNAL_TOKEN")
+
+    # The authenticated principals of the tokens that are cached in every worker
+    # with the max number of entries, and the seconds that the found principal
+    # and the missing one are kept before they are read again.
+    PRINCIPAL_CACHE_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL: float = 30
+    PRINCIPAL_CACHE_NEGATIVE_TTL: float = 5
+
+    # The number of processes for bcrypt hashing (default is the number of CPUs),
+    # and the number of hashing operations that run in the pool at the same time.
+    PASSWORD_HASH_WORKERS: Optional[int] = int(os.environ.get("PASSWORD_HASH_WORKERS") or 0) or None
+    PASSWORD_HASH_CONCURRENCY: int = int(os.environ.get("PASSWORD_HASH_CONCURRENCY") or 4)
+
+    # Rate limits of the login and register endpoints as (requests, seconds) per
+    # client IP and per account. The limits are kept in memory of every worker, or
+    # in the SQLite file that is shared by the workers if the path is set.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_STORAGE_PATH: Optional[str] = os.environ.get("RATE_LIMIT_STORAGE_PATH")
+    RATE_LIMIT_LOGIN_IP: tuple = (20, 60)
+    RATE_LIMIT_LOGIN_ACCOUNT: tuple = (5, 60)
+    RATE_LIMIT_REGISTER_IP: tuple = (5, 60)
+    RATE_LIMIT_REGISTER_ACCOUNT: tuple = (3, 60)
 
     # SQLAlchemy Configuration
     SQLALCHEMY_DATABASE_URL: str = os.environ.get("DATABASE_URL", f"sqlite:///{BASE_DIR}/db.sqlite3")
@@ -124,6 +151,90 @@ class BaseConfig:
     SQLALCHEMY_DATABASE_CONNECT_DICT: dict = {}
     SQLALCHEMY_ECHO_SQL: bool = False
 
+    # Send the SQL and template timings of the request in the `Server-Timing`
+    # header, and log the statements that run at least this number of times in
+    # one request as the N+1 pattern (0 is disabled).
+    SERVER_TIMING_ENABLED: bool = True
+    SQL_N_PLUS_ONE_THRESHOLD: int = 0
+
+    # The read-only services take their connections from the separate pool on the
+    # replica, or on the same SQLite file opened with `mode=ro` if it is not set,
+    # so the long reads do not hold the connections of the writers.
+    SQLALCHEMY_DATABASE_READ_ASYNC_URL: Optional[str] = os.environ.get("DATABASE_READ_URL")
+    SQLALCHEMY_POOL_SIZE: int = 5
+    SQLALCHEMY_MAX_OVERFLOW: int = 10
+    SQLALCHEMY_READ_POOL_SIZE: int = 10
+    SQLALCHEMY_READ_MAX_OVERFLOW: int = 10
+
+    # The pre-ping costs the extra round trip on every checkout, and the local SQLite
+    # file does not drop its connections, so it is off unless the server database
+    # needs it. The recycle of -1 keeps the connections open for the worker lifetime.
+    # docs: https://docs.sqlalchemy.org/en/20/core/pooling.html#dealing-with-disconnects
+    SQLALCHEMY_POOL_RECYCLE: int = -1
+    SQLALCHEMY_POOL_PRE_PING: bool = os.environ.get("DATABASE_POOL_PRE_PING", "").lower() in ("1", "true")
+    SQLALCHEMY_POOL_TIMEOUT: float = 30.0
+
+    # Open `pool_size` connections of every engine at startup, so the first requests
+    # of the worker do not pay for the connect and the pragmas.
+    SQLALCHEMY_POOL_PREWARM: bool = False
+
+    # The page size of the keyset pagination, and its hard cap.
+    PAGINATION_DEFAULT_LIMIT: int = 50
+    PAGINATION_MAX_LIMIT: int = 100
+
+    # The rows that the streaming list endpoints fetch from the cursor at a time.
+    STREAM_BATCH_SIZE: int = 500
+
+    # The max number of items of the bulk create endpoints.
+    BULK_MAX_ITEMS: int = 1000
+
+    # The search box request waits for this delay, and it is dropped if the newer
+    # keystroke of the same session arrives in the meantime.
+    SEARCH_DEBOUNCE_SECONDS: float = 0.15
+
+    # The file lock that one worker holds while it migrates the schema.
+    SCHEMA_LOCK_PATH: str = f"{BASE_DIR}/.cache/schema.lock"
+
+    # Pragmas that are set on every new SQLite connection of the sync and async
+    # engines. WAL lets the readers run concurrently with the writer, and the
+    # busy timeout makes the writer wait for the lock instead of failing at once.
+    # docs: https://www.sqlite.org/pragma.html
+    SQLALCHEMY_SQLITE_PRAGMAS: dict = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        # Negative value is the size in KiB, so it is 16MiB page cache. The cache is
+        # private to every connection of the pools, while the memory map is shared
+        # by them through the page cache of the OS.
+        "cache_size": -16000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    }
+
+    # Static Configuration
+    STATIC_DIR: str = f"{BASE_DIR}/backend/static"
+    STATIC_BUILD_DIR: str = f"{BASE_DIR}/.cache/static"
+
+    # Compression Configuration
+    COMPRESSION_MINIMUM_SIZE: int = 500
+    COMPRESSION_LEVEL: int = 6
+    COMPRESSION_CONTENT_TYPES: List[str] = [
+        "text/html",
+        "text/css",
+        "text/plain",
+        "text/javascript",
+        "application/javascript",
+        "application/json",
+        "application/x-ndjson",
+        "image/svg+xml",
+    ]
+
+    # Template Configuration
+    TEMPLATES_DIR: str = f"{BASE_DIR}/backend/templates"
+    TEMPLATES_AUTO_RELOAD: bool = True
+    TEMPLATES_BYTECODE_CACHE_DIR: Optional[str] = f"{BASE_DIR}/.cache/templates"
+    TEMPLATES_FRAGMENT_CACHE_SIZE: int = 2048
+
     # Logging Configuration
     LOGGING_LEVEL: str = logging.DEBUG
     LOGGING_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -166,26 +277,57 @@ class BaseConfig:
     SMTP_HOST: Optional[str] = os.environ.get('SMTP_HOST')
     SMTP_USER: Optional[str] = os.environ.get('SMTP_USER')
     SMTP_PASSWORD: Optional[str] = os.environ.get('SMTP_PASSWORD')
+    SMTP_TIMEOUT: float = 10.0
     EMAILS_FROM_EMAIL: Optional[EmailStr] = 'from@example.com'
     EMAILS_FROM_NAME: Optional[str] = 'Admin'
 
     EMAIL_RESET_TOKEN_EXPIRE_HOURS: int = 48
     EMAIL_TEMPLATES_DIR: str = f"{BASE_DIR}/backend/templates/emails"
+    EMAIL_TEMPLATES_AUTO_RELOAD: bool = False
     EMAILS_ENABLED: bool = True
 
+    # The outbound mail queue sends up to MAIL_BATCH_SIZE messages over one SMTP
+    # connection, and drops the message over MAIL_MAX_IN_FLIGHT queued messages.
+    MAIL_BATCH_SIZE: int = 50
+    MAIL_MAX_IN_FLIGHT: int = 1000
+    MAIL_MAX_RETRIES: int = 5
+    MAIL_RETRY_BACKOFF: float = 1.0
+
     EMAIL_TEST_USER: EmailStr = "test@example.com"  # type: ignore
 
 
 class DevelopmentConfig(BaseConfig):
-    pass
+    EMAIL_TEMPLATES_AUTO_RELOAD: bool = True
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
+    SQLALCHEMY_POOL_SIZE: int = 2
+    SQLALCHEMY_MAX_OVERFLOW: int = 5
+    SQLALCHEMY_READ_POOL_SIZE: int = 2
+    SQLALCHEMY_READ_MAX_OVERFLOW: int = 5
 
 
 class ProductionConfig(BaseConfig):
-    pass
+    TEMPLATES_AUTO_RELOAD: bool = False
+    SERVER_TIMING_ENABLED: bool = False
+    # SQLite runs one writer at a time, so the writers need few connections, and
+    # the readers about one per concurrent request of the worker. The pools are
+    # prewarmed, so every connection holds its page cache for the worker lifetime.
+    SQLALCHEMY_POOL_SIZE: int = 2
+    SQLALCHEMY_MAX_OVERFLOW: int = 2
+    SQLALCHEMY_READ_POOL_SIZE: int = 4
+    SQLALCHEMY_READ_MAX_OVERFLOW: int = 4
+    SQLALCHEMY_POOL_RECYCLE: int = 1800
+    SQLALCHEMY_POOL_TIMEOUT: float = 10.0
+    SQLALCHEMY_POOL_PREWARM: bool = True
 
 
 class TestingConfig(BaseConfig):
-    pass
+    SEARCH_DEBOUNCE_SECONDS: float = 0.0
+    SQLALCHEMY_POOL_SIZE: int = 1
+    SQLALCHEMY_READ_POOL_SIZE: int = 1
+    SQLALCHEMY_SQLITE_PRAGMAS: dict = {
+        **BaseConfig.SQLALCHEMY_SQLITE_PRAGMAS,
+        "synchronous": "OFF",
+    }
 
 
 @lru_cache()
@@ -1,8 +1,12 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import and_, delete, insert, lambda_stmt, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from .database import Base
+from .pagination import PageParams
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -60,3 +64,136 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.delete(obj)
         db.commit()
         return obj
+
+
+class AsyncRepository(Generic[ModelType]):
+    """Async generic repository of the model on `AsyncSession`. The read statements
+    are built with `lambda_stmt`, so SQLAlchemy caches them by the code of their
+    lambdas, and the later calls skip building the statement and its cache key.
+    The writes are single `INSERT`, `UPDATE` and `DELETE ... RETURNING` statements
+    without the flush-then-refresh round trips.
+
+    usages:
+
+        ..> tickets = AsyncRepository(Ticket, keys={'create_at': datetime, 'id': int})
+        ... async with async_session.begin() as session:
+        ...     ticket = await tickets.get(session, 1)
+        ...     rows, next_cursor = await tickets.list(session, page)
+        ...     ticket = await tickets.update(session, 1, {'text': 'text'})
+
+    """
+
+    def __init__(self, model: Type[ModelType], *, keys: Optional[Dict[str, type]] = None) -> None:
+        self.model: Type[ModelType] = model
+
+        # The sort key of the keyset pagination with the types of its cursor values.
+        self.keys: Dict[str, type] = keys or {"id": int}
+        if len(self.keys) not in (1, 2):
+            raise ValueError("the keyset pagination supports one or two sort keys")
+
+    async def get(self, session: AsyncSession, id: Any) -> Optional[ModelType]:
+        model = self.model
+        stmt = lambda_stmt(lambda: select(model).where(model.id == id))
+        return (await session.scalars(stmt)).first()
+
+    async def get_many(self, session: AsyncSession, ids: Sequence[Any]) -> List[ModelType]:
+        """Return the rows of the ids with one `IN` query in the order of the ids"""
+        if not ids:
+            return []
+        model = self.model
+        ids = list(ids)
+        stmt = lambda_stmt(lambda: select(model).where(model.id.in_(ids)))
+        rows = {row.id: row for row in await session.scalars(stmt)}
+        return [rows[id] for id in ids if id in rows]
+
+    async def list(self, session: AsyncSession, page: PageParams) -> Tuple[List[ModelType], Optional[str]]:
+        """Return the rows of the page ordered by the sort key, and the cursor of
+        the next page.
+        """
+        model = self.model
+        columns = [getattr(model, key) for key in self.keys]
+        limit = page.limit + 1
+        stmt = lambda_stmt(lambda: select(model))
+        if (after := page.after(*self.keys.values())) is not None:
+            # The row value comparison does not work in the lambda statement, so
+            # it is expanded to `a > x OR (a = x AND b > y)`.
+            if len(columns) == 1:
+                (first, ), (first_value, ) = columns, after
+                stmt += lambda s: s.where(first > first_value)
+            else:
+                (first, second), (first_value, second_value) = columns, after
+                stmt += lambda s: s.where(
+                    or_(first > first_value, and_(first == first_value, second > second_value))
+                )
+        stmt += lambda s: s.order_by(*columns).limit(limit)
+
+        # Fetch one more row to know if there is the next page.
+        rows = (await session.scalars(stmt)).all()
+        return page.page(rows, *self.keys)
+
+    async def create_many(self, session: AsyncSession, values: List[Dict[str, Any]]) -> List[ModelType]:
+        """Insert the rows with one multi-row `INSERT ... RETURNING`, and return them
+        in the order of the values.
+        """
+        if not values:
+            return []
+        rows = (await session.scalars(insert(self.model).returning(self.model), values)).all()
+
+        # SQLite assigns the ascending ids in the order of the inserted rows.
+        return sorted(rows, key=lambda row: row.id)
+
+    async def upsert(
+            self,
+            session: AsyncSession,
+            values: List[Dict[str, Any]],
+            *,
+            index_elements: List[str],
+            update_fields: Optional[List[str]] = None,
+    ) -> List[ModelType]:
+        """Insert the rows, or update the `update_fields` of the rows that conflict
+        on the unique `index_elements`, with one `INSERT ... ON CONFLICT` statement.
+        """
+        if not values:
+            return []
+        dialect = session.bind.dialect.name
+        if dialect not in ("sqlite", "postgresql"):
+            raise NotImplementedError(f"upsert is not supported on {dialect}")
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = dialect_insert(self.model).values(values)
+        fields = update_fields or [key for key in values[0] if key not in index_elements]
+        stmt = stmt.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={field: stmt.excluded[field] for field in fields},
+        ).returning(self.model)
+
+        # The updated rows that are already loaded in the session are refreshed
+        # from RETURNING.
+        # docs: https://docs.sqlalchemy.org/en/20/orm/queryguide/dml.html#using-returning-with-upsert-statements
+        stmt = select(self.model).from_statement(stmt).execution_options(populate_existing=True)
+        return (await session.scalars(stmt)).all()
+
+    async def update(self, session: AsyncSession, id: Any, values: Dict[str, Any]) -> Optional[ModelType]:
+        """Update the row with one `UPDATE ... RETURNING`, or return None if the row
+        does not exist. The `onupdate` defaults, like `update_at`, are applied, and
+        the row that is already loaded in the session is synchronized from RETURNING.
+        """
+        stmt = (
+            update(self.model)
+            .where(self.model.id == id)
+            .values(**values)
+            .returning(self.model)
+            .execution_options(synchronize_session="fetch")
+        )
+        return (await session.scalars(stmt)).first()
+
+    async def delete(self, session: AsyncSession, id: Any) -> Optional[ModelType]:
+        """Delete the row with one `DELETE ... RETURNING`, or return None if the row
+        does not exist.
+        """
+        stmt = (
+            delete(self.model)
+            .where(self.model.id == id)
+            .returning(self.model)
+            .execution_options(synchronize_session="fetch")
+        )
+        return (await session.scalars(stmt)).first()
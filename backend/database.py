@@ -1,19 +1,62 @@
 from typing import Any
 import logging
-from typing import AsyncIterator, AsyncGenerator
+from typing import AsyncIterator, AsyncGenerator, Dict, Optional, Union
 from fastapi import Depends
-from sqlalchemy import MetaData, create_engine
+from sqlalchemy import URL, Connection, MetaData, create_engine, event, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import as_declarative, declared_attr
 from .config import settings
+from .pools import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+from .instrumentation import instrument
 
 logger = logging.getLogger(__name__)
 
+
+def is_sqlite_memory(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def read_only_url(url: Union[str, URL]) -> URL:
+    """Return the URL of the same SQLite file that is opened read-only with the URI
+    filename, or the URL itself for the other databases.
+
+    usages:
+
+        ..> read_only_url('sqlite+aiosqlite:///db.sqlite3')
+        sqlite+aiosqlite:///file:db.sqlite3?mode=ro&uri=true
+
+    """
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite" or is_sqlite_memory(url) or "uri" in url.query:
+        return url
+    # docs: https://docs.sqlalchemy.org/en/20/dialects/sqlite.html#uri-connections
+    return url.set(database=f"file:{url.database}", query={**url.query, "mode": "ro", "uri": "true"})
+
+
+def pool_options(url: Union[str, URL], pool_class: type, pool_size: int, max_overflow: int) -> Dict[str, Any]:
+    """Return the pool options of the engine from the settings of the environment.
+    The aiosqlite dialect defaults to `NullPool` on the file database, that opens
+    the new connection for every session, so the queue pool is set explicitly.
+    The SQLite in-memory database keeps the pool of its dialect.
+    """
+    options: Dict[str, Any] = {"pool_pre_ping": settings.SQLALCHEMY_POOL_PRE_PING}
+    if is_sqlite_memory(make_url(url)):
+        return options
+    return {
+        **options,
+        "poolclass": pool_class,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_recycle": settings.SQLALCHEMY_POOL_RECYCLE,
+        "pool_timeout": settings.SQLALCHEMY_POOL_TIMEOUT,
+    }
+
+
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URL,
     echo=settings.SQLALCHEMY_ECHO_SQL,
@@ -25,16 +68,22 @@ engine = create_engine(
         # request, so we need to make SQLite know that it should allow that with,
         # docs: https://fastapi.tiangolo.com/tutorial/sql-databases/
         "check_same_thread": False
-    }
+    },
+    **pool_options(
+        settings.SQLALCHEMY_DATABASE_URL,
+        InstrumentedQueuePool,
+        settings.SQLALCHEMY_POOL_SIZE,
+        settings.SQLALCHEMY_MAX_OVERFLOW,
+    ),
 )
 SessionLocal = sessionmaker(
     bind=engine, autoflush=False, autocommit=False, future=True
 )
 
+
 async_engine = create_async_engine(
     settings.SQLALCHEMY_DATABASE_ASYNC_URL,
     echo=settings.SQLALCHEMY_ECHO_SQL,
-    pool_pre_ping=True,
     connect_args={
         # This is needed only for SQLite. It's not needed for other databases.
         # By this example, it use SQLite because it uses a single file and Python
@@ -43,7 +92,13 @@ async_engine = create_async_engine(
         # request, so we need to make SQLite know that it should allow that with,
         # docs: https://fastapi.tiangolo.com/tutorial/sql-databases/
         "check_same_thread": False
-    }
+    },
+    **pool_options(
+        settings.SQLALCHEMY_DATABASE_ASYNC_URL,
+        InstrumentedAsyncQueuePool,
+        settings.SQLALCHEMY_POOL_SIZE,
+        settings.SQLALCHEMY_MAX_OVERFLOW,
+    ),
 )
 AsyncSessionLocal = async_sessionmaker(
     bind=async_engine, autoflush=False, autocommit=False,
@@ -55,6 +110,77 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False
 )
 
+
+def create_async_read_engine(primary: AsyncEngine, url: Optional[str] = None) -> AsyncEngine:
+    """Return the engine of the read-only services on the replica `url`, or on the
+    same SQLite file of the `primary` engine that is opened read-only. In the WAL
+    mode, its readers do not block the writer of the primary engine and do not wait
+    for it. The SQLite in-memory database is private to its connection, so the
+    read-only services share the primary engine instead of their own empty database.
+
+    usages:
+
+        ..> create_async_read_engine(create_async_engine('sqlite+aiosqlite:///db.sqlite3')).url
+        sqlite+aiosqlite:///file:db.sqlite3?mode=ro&uri=true
+
+    """
+    if url is None and is_sqlite_memory(primary.url):
+        return primary
+    return create_async_engine(
+        url or read_only_url(primary.url),
+        echo=settings.SQLALCHEMY_ECHO_SQL,
+        connect_args={"check_same_thread": False},
+        **pool_options(
+            url or primary.url,
+            InstrumentedAsyncQueuePool,
+            settings.SQLALCHEMY_READ_POOL_SIZE,
+            settings.SQLALCHEMY_READ_MAX_OVERFLOW,
+        ),
+    )
+
+
+async_read_engine = create_async_read_engine(async_engine, settings.SQLALCHEMY_DATABASE_READ_ASYNC_URL)
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine, autoflush=False, autocommit=False, future=True, expire_on_commit=False
+)
+
+# The values of pragmas that SQLite returns as the integer.
+SQLITE_PRAGMA_VALUES: Dict[str, Dict[str, int]] = {
+    "synchronous": {"OFF": 0, "NORMAL": 1, "FULL": 2, "EXTRA": 3},
+    "temp_store": {"DEFAULT": 0, "FILE": 1, "MEMORY": 2},
+}
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Set the pragmas of the SQLite profile on the new DBAPI connection"""
+    cursor = dbapi_connection.cursor()
+    for name, value in settings.SQLALCHEMY_SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def verify_sqlite_pragmas(connection: Connection) -> Dict[str, str]:
+    """Read the pragmas back from the connection, and log the pragmas that SQLite
+    did not apply, like the WAL mode on the in-memory database.
+    """
+    applied: Dict[str, str] = {}
+    for name, expected in settings.SQLALCHEMY_SQLITE_PRAGMAS.items():
+        value = connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+        expected = SQLITE_PRAGMA_VALUES.get(name, {}).get(str(expected).upper(), expected)
+        applied[name] = str(value).lower()
+        if applied[name] != str(expected).lower():
+            logger.warning(f"SQLite pragma {name} is {value}, expected {expected}")
+    return applied
+
+
+# The read engine is the primary engine itself on the SQLite in-memory database.
+for _engine in dict.fromkeys((engine, async_engine.sync_engine, async_read_engine.sync_engine)):
+    instrument(_engine)
+    if _engine.dialect.name == "sqlite":
+        # The pragmas are set on every new connection of the pool.
+        # docs: https://www.sqlite.org/pragma.html
+        event.listen(_engine, "connect", set_sqlite_pragmas)
+
 # Explicitly setting the indexes' namings according to your
 # database's convention is preferable over sqlalchemy's.
 # docs: https://github.com/zhanymkanov/fastapi-best-practices#11-sqlalchemy-set-db-keys-naming-convention
@@ -93,15 +219,34 @@ async def get_session():
         session.close()
 
 
-async def get_async_session() -> AsyncIterator[sessionmaker]:
-    """Get database session with asynchronous"""
-    try:
-        yield AsyncSessionLocal
-    except SQLAlchemyError as err:
-        logger.error(err)
-    finally:
-        # await async_engine.dispose()
-        ...
+class SessionProvider:
+    """Dependency that routes the service to the session factory of the primary
+    engine, or of the read-only engine with the `readonly` flag.
+
+    implemented:
+
+        ..> class ReadUser:
+        ...     def __init__(self, session: sessionmaker = Depends(get_async_read_session)):
+        ...         self.async_session = session
+
+    """
+
+    def __init__(self, readonly: bool = False) -> None:
+        self.readonly: bool = readonly
+
+    async def __call__(self) -> AsyncIterator[async_sessionmaker]:
+        """Get database session with asynchronous"""
+        try:
+            yield AsyncReadSessionLocal if self.readonly else AsyncSessionLocal
+        except SQLAlchemyError as err:
+            logger.error(err)
+        finally:
+            # await async_engine.dispose()
+            ...
+
+
+get_async_session = SessionProvider()
+get_async_read_session = SessionProvider(readonly=True)
 
 
 async def get_async_session_open() -> AsyncGenerator[AsyncSession, None]:
@@ -115,6 +260,13 @@ class BaseCRUD:
         self.async_session = session
 
 
+class BaseReadCRUD(BaseCRUD):
+    """The service that only reads, and runs on the read-only engine"""
+
+    def __init__(self, session: sessionmaker = Depends(get_async_read_session)) -> None:
+        super().__init__(session)
+
+
 # def init_db():
 #     # Tables should be created with Alembic migrations. But if you don't want to use migrations,
 #     # create the tables un-commenting the next line
@@ -1,6 +1,9 @@
-from fastapi import HTTPException
+import secrets
+from fastapi import Header, HTTPException, status
 from fastapi.routing import APIRoute
 from fastapi.templating import Jinja2Templates
+from .templating import TemplateEngine
+from .templating import get_template_engine
 from .config import settings
 
 
@@ -22,8 +25,25 @@ async def get_query_token(token: str):
         raise HTTPException(status_code=400, detail="No `test` token provided")
 
 
+async def get_token_header(x_token: str = Header(...)):
+    """Check the token of the internal endpoints from the `X-Token` header.
+
+    implemented:
+
+        ..> app.include_router(admin, dependencies=[Depends(get_token_header)])
+
+    usages:
+
+        ..> $ curl -H "X-Token: <token:string>" http://localhost:8000/api/v1/stats
+
+    """
+    if not settings.INTERNAL_TOKEN or not secrets.compare_digest(x_token, settings.INTERNAL_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid `X-Token` header")
+
+
 async def get_templates() -> Jinja2Templates:
-    """Return Jinja2 template object for HTMLResponse in this application.
+    """Return Jinja2 template object for HTMLResponse in this application. This
+    object is shared by all requests of the current process.
 
     implemented:
 
@@ -32,22 +52,20 @@ async def get_templates() -> Jinja2Templates:
         ...     return ...
 
     """
-    return Jinja2Templates(
-        directory=f'{settings.BASE_DIR}/backend/templates',
-        autoescape=True,
-
-        # Strip left of spaces in any blocks of HTML template.
-        lstrip_blocks=True,
-
-        # # Handle multi-template folders in the FastAPI application with the Starlette.
-        # # docs: https://accent-starlette.github.io/starlette-core/templating/
-        # loader=jinja2.ChoiceLoader(
-        #     [
-        #         jinja2.FileSystemLoader("templates"),
-        #         jinja2.PackageLoader("admin", "templates"),
-        #     ]
-        # )
-    )
+    return get_template_engine().templates
+
+
+async def get_engine() -> TemplateEngine:
+    """Return the template engine of this process for the streaming responses.
+
+    implemented:
+
+        .>> @router.get('...')
+        ... async def display(engine: TemplateEngine = Depends(get_engine)):
+        ...     return engine.stream('...', context)
+
+    """
+    return get_template_engine()
 
 
 def custom_generate_unique_id(route: APIRoute):
@@ -0,0 +1,108 @@
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import Engine, event
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RequestMetrics:
+    """Counters of the SQL statements and the named timings of one request. The
+    object is set in the context variable for the request, so the engine hooks
+    that run in the threadpool or in the greenlet of the async engine add to it.
+
+    usages:
+
+        ..> metrics = RequestMetrics()
+        ... token = request_metrics.set(metrics)
+        ... ...
+        ... response.headers["Server-Timing"] = metrics.server_timing(total)
+
+    """
+
+    def __init__(self) -> None:
+        self.statements: int = 0
+        self.sql_time: float = 0.0
+        self.timings: Dict[str, float] = {}
+
+        # The number of times that every statement text runs in the request, that
+        # is kept only with the N+1 detector on.
+        self.repeats: Counter = Counter()
+
+    def add(self, name: str, seconds: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def server_timing(self, total_ms: float) -> str:
+        """Return the value of the `Server-Timing` header with the SQL time, the other
+        named timings, like the template render, and the total time in milliseconds.
+        docs: https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Server-Timing
+        """
+        metrics = [f'sql;dur={self.sql_time * 1000:.2f};desc="{self.statements} statements"']
+        metrics += [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.timings.items()]
+        metrics.append(f"total;dur={total_ms:.2f}")
+        return ", ".join(metrics)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Return the statements that run at least `threshold` times in the request,
+        which is the N+1 pattern of the lazy loads or of the queries in the loop.
+        """
+        return [(statement, count) for statement, count in self.repeats.most_common() if count >= threshold]
+
+
+request_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+@contextmanager
+def timing(name: str) -> Iterator[None]:
+    """Add the time of the block to the named timing of the current request"""
+    if (metrics := request_metrics.get()) is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(name, time.perf_counter() - started)
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if request_metrics.get() is not None:
+        # The statements of one connection do not overlap, so the connection keeps
+        # only the start time of its current statement.
+        # docs: https://docs.sqlalchemy.org/en/20/faq/performance.html#query-profiling
+        conn.info["query_start_time"] = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    observe(conn, statement)
+
+
+def handle_error(context) -> None:
+    """Count the statement that raises, that does not reach `after_cursor_execute`,
+    and clear its start time from the connection.
+    """
+    if context.connection is not None and context.statement is not None:
+        observe(context.connection, context.statement)
+
+
+def observe(conn, statement: str) -> None:
+    started = conn.info.pop("query_start_time", None)
+    if (metrics := request_metrics.get()) is None or started is None:
+        return
+    metrics.statements += 1
+    metrics.sql_time += time.perf_counter() - started
+    if settings.SQL_N_PLUS_ONE_THRESHOLD:
+        metrics.repeats[statement] += 1
+
+
+def instrument(engine: Engine) -> None:
+    """Add the SQL metrics hooks to the engine, or to the `sync_engine` of the async
+    engine.
+    """
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
@@ -0,0 +1 @@
+from .admin.routes import admin
@@ -0,0 +1,35 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+
+admin = APIRouter(
+    tags=["admin"],
+    include_in_schema=False,
+)
+
+
+@admin.get("/stats")
+async def stats() -> JSONResponse:
+    """Return the counters of the in-process caches and middlewares of this worker"""
+    from ...templating import fragment_cache
+    from ...middlewares import compression_stats
+    from ...securities import password_service
+    from ...routers.auth.dependencies import token_cache
+    from ...routers.users.crud import principal_cache
+    from ...utils.mailer import mail_queue
+    from ...database import engine, async_engine, async_read_engine
+    from ...pools import pool_stats
+
+    return JSONResponse({
+        "fragments": fragment_cache.stats(),
+        "compression": compression_stats.stats(),
+        "passwords": password_service.stats(),
+        "tokens": token_cache.stats(),
+        "principals": principal_cache.stats(),
+        "mail": mail_queue.stats(),
+        "pools": {
+            "sync": pool_stats(engine),
+            "async": pool_stats(async_engine.sync_engine),
+            "async_read": pool_stats(async_read_engine.sync_engine),
+        },
+    })
@@ -0,0 +1,131 @@
+import zlib
+from typing import Any, Dict, Iterable, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class CompressionStats:
+    """Counters of the compression middleware of this worker"""
+
+    def __init__(self) -> None:
+        self.responses: int = 0
+        self.skipped: int = 0
+        self.bytes_in: int = 0
+        self.bytes_out: int = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "responses": self.responses,
+            "skipped": self.skipped,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": round(self.bytes_out / self.bytes_in, 4) if self.bytes_in else 0.0,
+        }
+
+
+compression_stats: CompressionStats = CompressionStats()
+
+
+class CompressionMiddleware:
+    """Gzip compression middleware. It compresses the response that has the allowed
+    content type and is larger than the minimum size, and compresses the streaming
+    response chunk by chunk without buffering it. The response that is already
+    encoded, like the precompressed static files, passes through as is.
+
+    usages:
+
+        ..> app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            minimum_size: int = 500,
+            content_types: Iterable[str] = ("text/html", "application/json"),
+            compresslevel: int = 6,
+    ) -> None:
+        self.app = app
+        self.minimum_size: int = minimum_size
+        self.content_types: frozenset = frozenset(content_types)
+        self.compresslevel: int = compresslevel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("accept-encoding", ""):
+            responder = _GZipResponder(self, send)
+            await self.app(scope, receive, responder.send)
+        else:
+            await self.app(scope, receive, send)
+
+
+class _GZipResponder:
+    def __init__(self, middleware: CompressionMiddleware, send: Send) -> None:
+        self.middleware = middleware
+        self._send = send
+        self.start: Optional[Message] = None
+        self.compressor = None
+        self.passthrough: bool = False
+
+    def accepts(self, headers: Headers) -> bool:
+        content_type = headers.get("content-type", "").split(";")[0].strip()
+        return (
+            "content-encoding" not in headers
+            and content_type in self.middleware.content_types
+        )
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Delay the start message until the first body message, because the
+            # headers depend on the size of the body.
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+        if self.compressor is None:
+            headers = Headers(raw=self.start["headers"])
+            if (
+                    not self.accepts(headers)
+                    or (not more_body and len(body) < self.middleware.minimum_size)
+            ):
+                compression_stats.skipped += 1
+                self.passthrough = True
+                await self._send(self.start)
+                await self._send(message)
+                return
+
+            compression_stats.responses += 1
+            self.compressor = zlib.compressobj(self.middleware.compresslevel, zlib.DEFLATED, 31)
+            headers = MutableHeaders(raw=self.start["headers"])
+            headers["Content-Encoding"] = "gzip"
+            headers.add_vary_header("Accept-Encoding")
+            if (etag := headers.get("etag")) and not etag.startswith("W/"):
+                # The compressed body is not byte-for-byte equal to the original.
+                headers["ETag"] = f"W/{etag}"
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                compressed = self.compressor.compress(body) + self.compressor.flush()
+                headers["Content-Length"] = str(len(compressed))
+                self._count(body, compressed)
+                await self._send(self.start)
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+            await self._send(self.start)
+
+        # Flush every chunk of the streaming response, so the client can parse it
+        # before the next chunk is ready.
+        compressed = self.compressor.compress(body)
+        compressed += self.compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+        self._count(body, compressed)
+        await self._send(
+            {"type": "http.response.body", "body": compressed, "more_body": more_body}
+        )
+
+    @staticmethod
+    def _count(body: bytes, compressed: bytes) -> None:
+        compression_stats.bytes_in += len(body)
+        compression_stats.bytes_out += len(compressed)
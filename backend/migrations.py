@@ -0,0 +1,297 @@
+"""Versioned schema management. The applied schema revisions are recorded in the
+`schema_version` table, so the startup skips the DDL when the schema is current,
+and applies the forward revisions under a cross-process file lock, so only one
+worker migrates the database.
+
+usages:
+
+    ..> $ python -m backend.migrations        # Apply the pending revisions
+
+"""
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Set, Tuple, Union
+from sqlalchemy import Connection, Engine, text
+from .config import settings
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+Revision = Callable[[Connection], None]
+
+# The forward revisions of the schema by their number.
+REVISIONS: Dict[int, Tuple[str, Revision]] = {}
+
+
+def revision(number: int, description: str) -> Callable[[Revision], Revision]:
+    """Register the function that migrates the schema to the revision `number`
+
+    implemented:
+
+        ..> @revision(2, 'add the search index of tickets')
+        ... def add_search_index(connection: Connection) -> None:
+        ...     connection.exec_driver_sql('CREATE VIRTUAL TABLE ...')
+
+    """
+    def decorator(func: Revision) -> Revision:
+        if number in REVISIONS:
+            raise ValueError(f"schema revision {number} is registered twice")
+        REVISIONS[number] = (description, func)
+        return func
+    return decorator
+
+
+def head() -> int:
+    return max(REVISIONS, default=0)
+
+
+class FileLock:
+    """Exclusive lock on the file, that is held across the worker processes on
+    the same host.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path: Path = Path(path)
+        self._file = None
+
+    def __enter__(self) -> "FileLock":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a+")
+        if sys.platform == "win32":
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if sys.platform == "win32":
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+
+
+def current_revision(connection: Connection) -> int:
+    if not connection.dialect.has_table(connection, "schema_version"):
+        return 0
+    return connection.execute(text("SELECT MAX(revision) FROM schema_version")).scalar() or 0
+
+
+def migrate(engine: Engine, lock_path: Union[str, Path, None] = None) -> int:
+    """Apply the pending revisions to the database and return the current revision"""
+    with engine.connect() as connection:
+        current = current_revision(connection)
+    if current >= head():
+        return current
+
+    with FileLock(lock_path or settings.SCHEMA_LOCK_PATH):
+        with engine.begin() as connection:
+            if connection.dialect.name == "sqlite":
+                # The pysqlite driver does not begin the transaction before DDL, so
+                # every statement would commit on its own, and the revision that
+                # fails halfway would be left half applied.
+                # docs: https://docs.sqlalchemy.org/en/20/dialects/sqlite.html#serializable-isolation-savepoints-transactional-ddl
+                connection.exec_driver_sql("BEGIN IMMEDIATE")
+            connection.execute(text(
+                "CREATE TABLE IF NOT EXISTS schema_version ("
+                "revision INTEGER PRIMARY KEY, description TEXT NOT NULL, applied_at TIMESTAMP NOT NULL)"
+            ))
+            # The other worker may have migrated while this one waited for the lock.
+            current = current_revision(connection)
+            for number in sorted(n for n in REVISIONS if n > current):
+                description, func = REVISIONS[number]
+                logger.info(f"applying schema revision {number}: {description}")
+                func(connection)
+                connection.execute(
+                    text(
+                        "INSERT INTO schema_version (revision, description, applied_at) "
+                        "VALUES (:revision, :description, :applied_at)"
+                    ),
+                    {"revision": number, "description": description, "applied_at": datetime.now()},
+                )
+                current = number
+    return current
+
+
+# The DDL of the revisions is frozen as it was when the revision was added, so
+# the revision does not change with the models. The tables of the databases that
+# are created before the versioned schema are kept by `IF NOT EXISTS`, and the
+# later revisions bring them up to date.
+INITIAL_TABLES: str = """
+CREATE TABLE IF NOT EXISTS main.tickets (
+    id INTEGER NOT NULL,
+    text VARCHAR,
+    description VARCHAR,
+    session_key VARCHAR,
+    create_at DATETIME,
+    update_at DATETIME,
+    CONSTRAINT tickets_pkey PRIMARY KEY (id)
+);
+CREATE INDEX IF NOT EXISTS main.main_tickets_text_idx ON tickets (text);
+CREATE INDEX IF NOT EXISTS main.main_tickets_id_idx ON tickets (id);
+CREATE INDEX IF NOT EXISTS main.main_tickets_session_key_idx ON tickets (session_key);
+CREATE INDEX IF NOT EXISTS main.main_tickets_description_idx ON tickets (description);
+CREATE TABLE IF NOT EXISTS main.users (
+    id INTEGER NOT NULL,
+    username VARCHAR,
+    email VARCHAR,
+    hashed_password VARCHAR NOT NULL,
+    is_active BOOLEAN,
+    is_superuser BOOLEAN,
+    create_at DATETIME,
+    update_at DATETIME,
+    CONSTRAINT users_pkey PRIMARY KEY (id)
+);
+CREATE INDEX IF NOT EXISTS main.main_users_id_idx ON users (id);
+CREATE UNIQUE INDEX IF NOT EXISTS main.main_users_email_idx ON users (email);
+CREATE UNIQUE INDEX IF NOT EXISTS main.main_users_username_idx ON users (username);
+CREATE TABLE IF NOT EXISTS main.user_tickets (
+    id INTEGER NOT NULL,
+    text VARCHAR,
+    description VARCHAR,
+    create_at DATETIME,
+    owner_id INTEGER,
+    CONSTRAINT user_tickets_pkey PRIMARY KEY (id),
+    CONSTRAINT user_tickets_owner_id_fkey FOREIGN KEY(owner_id) REFERENCES users (id)
+);
+CREATE INDEX IF NOT EXISTS main.main_user_tickets_id_idx ON user_tickets (id);
+CREATE INDEX IF NOT EXISTS main.main_user_tickets_text_idx ON user_tickets (text);
+CREATE INDEX IF NOT EXISTS main.main_user_tickets_description_idx ON user_tickets (description);
+"""
+
+
+def execute_script(connection: Connection, script: str) -> None:
+    """Execute the `;` separated statements of the script, that has no trigger bodies"""
+    for statement in script.split(";"):
+        if statement.strip():
+            connection.exec_driver_sql(statement)
+
+
+def columns(connection: Connection, table: str) -> Set[str]:
+    return {row[1] for row in connection.exec_driver_sql(f"PRAGMA main.table_info({table})")}
+
+
+def now() -> str:
+    """Return the current datetime in the storage format of the SQLite DateTime"""
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+@revision(1, "create the initial tables")
+def create_initial_tables(connection: Connection) -> None:
+    execute_script(connection, INITIAL_TABLES)
+
+
+@revision(2, "add the keyset pagination index of tickets")
+def add_tickets_keyset_index(connection: Connection) -> None:
+    connection.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS main.tickets_create_at_id_idx ON tickets (create_at, id)"
+    )
+
+
+# The external content FTS5 tables keep only the full-text index, and read the
+# text of the rows from their content tables. The triggers keep the index in sync
+# with every insert, update and delete of the content table.
+# docs: https://www.sqlite.org/fts5.html#external_content_tables
+FTS_TRIGGERS: str = """
+CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN
+    INSERT INTO {table}_fts (rowid, text, description) VALUES (new.id, new.text, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN
+    INSERT INTO {table}_fts ({table}_fts, rowid, text, description)
+    VALUES ('delete', old.id, old.text, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE OF text, description ON {table} BEGIN
+    INSERT INTO {table}_fts ({table}_fts, rowid, text, description)
+    VALUES ('delete', old.id, old.text, old.description);
+    INSERT INTO {table}_fts (rowid, text, description) VALUES (new.id, new.text, new.description);
+END;
+"""
+
+
+@revision(3, "add the full-text search index of tickets and user tickets")
+def add_tickets_search_index(connection: Connection) -> None:
+    if connection.dialect.name != "sqlite":
+        logger.warning(f"the full-text search index is not supported on {connection.dialect.name}")
+        return
+    for table in ("tickets", "user_tickets"):
+        connection.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5("
+            f"text, description, content='{table}', content_rowid='id', tokenize='unicode61')"
+        )
+        for trigger in FTS_TRIGGERS.format(table=table).split("END;")[:-1]:
+            connection.exec_driver_sql(f"{trigger}END;")
+
+        # Index the existing rows.
+        connection.exec_driver_sql(f"INSERT INTO {table}_fts ({table}_fts) VALUES ('rebuild')")
+
+
+@revision(4, "add the create and update datetimes of users to the legacy tables")
+def add_users_datetimes(connection: Connection) -> None:
+    # The users table that is created before the datetimes of users were added
+    # is kept as it is by the revision 1.
+    existing = columns(connection, "users")
+    for column in ("create_at", "update_at"):
+        if column not in existing:
+            connection.exec_driver_sql(f"ALTER TABLE main.users ADD COLUMN {column} DATETIME")
+        connection.exec_driver_sql(f"UPDATE main.users SET {column} = ? WHERE {column} IS NULL", (now(), ))
+
+
+# The tickets table with the NOT NULL create datetime. SQLite can not add the
+# constraint to the existing column, so the table is rebuilt.
+# docs: https://www.sqlite.org/lang_altertable.html#otheralter
+# The default is the local time in the storage format of the SQLite DateTime, so
+# the rows that are inserted without the ORM sort with the other rows.
+TICKETS_NOT_NULL_CREATE_AT: str = """
+CREATE TABLE main.tickets_new (
+    id INTEGER NOT NULL,
+    text VARCHAR,
+    description VARCHAR,
+    session_key VARCHAR,
+    create_at DATETIME NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime') || '000'),
+    update_at DATETIME,
+    CONSTRAINT tickets_pkey PRIMARY KEY (id)
+);
+INSERT INTO main.tickets_new (id, text, description, session_key, create_at, update_at)
+SELECT id, text, description, session_key, create_at, update_at FROM main.tickets;
+DROP TABLE main.tickets;
+ALTER TABLE main.tickets_new RENAME TO tickets;
+CREATE INDEX main.main_tickets_text_idx ON tickets (text);
+CREATE INDEX main.main_tickets_id_idx ON tickets (id);
+CREATE INDEX main.main_tickets_session_key_idx ON tickets (session_key);
+CREATE INDEX main.main_tickets_description_idx ON tickets (description);
+CREATE INDEX main.tickets_create_at_id_idx ON tickets (create_at, id)
+"""
+
+
+@revision(5, "make the create datetime of tickets NOT NULL")
+def add_tickets_create_at_not_null(connection: Connection) -> None:
+    # The keyset pagination over (create_at, id) skips the rows without the create
+    # datetime, so they take the update datetime, or the time of the migration.
+    connection.execute(
+        text("UPDATE tickets SET create_at = COALESCE(update_at, :now) WHERE create_at IS NULL"),
+        {"now": now()},
+    )
+    if connection.dialect.name != "sqlite":
+        connection.exec_driver_sql("ALTER TABLE tickets ALTER COLUMN create_at SET NOT NULL")
+        return
+    execute_script(connection, TICKETS_NOT_NULL_CREATE_AT)
+
+    # The triggers of the search index are dropped with the old table.
+    for trigger in FTS_TRIGGERS.format(table="tickets").split("END;")[:-1]:
+        connection.exec_driver_sql(f"{trigger}END;")
+    connection.exec_driver_sql("INSERT INTO tickets_fts (tickets_fts) VALUES ('rebuild')")
+
+
+if __name__ == '__main__':
+    from .database import engine
+
+    print(f"schema revision: {migrate(engine)}")
@@ -0,0 +1,77 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Generic, List, Optional, Sequence, Tuple, TypeVar
+from fastapi import HTTPException, Query, status
+from pydantic.generics import GenericModel
+from .config import settings
+
+ItemType = TypeVar("ItemType")
+
+
+class Page(GenericModel, Generic[ItemType]):
+    """Page of the keyset pagination. The `next_cursor` is the opaque cursor of
+    the next page, or None on the last page.
+    """
+    items: List[ItemType]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row of the page to the opaque cursor"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> Tuple[Any, ...]:
+    """Decode the opaque cursor to the sort key with the `types` of its values"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError(cursor)
+        return tuple(
+            datetime.fromisoformat(value) if kind is datetime else kind(value)
+            for kind, value in zip(types, payload)
+        )
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+class PageParams:
+    """Dependency of the cursor and the page size of the keyset pagination. The
+    page size is capped by `PAGINATION_MAX_LIMIT`.
+
+    implemented:
+
+        ..> @router.get('/', response_model=Page[Schema])
+        ... async def read_all(page: PageParams = Depends(PageParams)):
+        ...     return ...
+
+    """
+
+    def __init__(
+            self,
+            cursor: Optional[str] = Query(None, description="The cursor of the page"),
+            limit: int = Query(
+                settings.PAGINATION_DEFAULT_LIMIT, ge=1, le=settings.PAGINATION_MAX_LIMIT
+            ),
+    ) -> None:
+        self.cursor: Optional[str] = cursor
+        self.limit: int = limit
+
+    def after(self, *types: type) -> Optional[Tuple[Any, ...]]:
+        """Return the decoded sort key that the page starts after"""
+        return decode_cursor(self.cursor, *types) if self.cursor else None
+
+    def page(self, rows: Sequence[Any], *keys: str) -> Tuple[Sequence[Any], Optional[str]]:
+        """Split the `limit + 1` fetched rows to the rows of this page and the
+        cursor of the next page, that is built from the `keys` of the last row.
+        """
+        if len(rows) <= self.limit:
+            return rows, None
+        rows = rows[:self.limit]
+        return rows, encode_cursor(*(getattr(rows[-1], key) for key in keys))
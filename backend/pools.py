@@ -0,0 +1,114 @@
+import bisect
+import threading
+import time
+from contextlib import AsyncExitStack, ExitStack
+from typing import Any, Dict, List, Tuple
+from sqlalchemy import AsyncAdaptedQueuePool, Engine, QueuePool
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class PoolMetrics:
+    """Counters of the connection checkouts of one pool, with the histogram of the
+    time that the checkout waited for the connection.
+    """
+
+    # The upper bounds of the wait time buckets in seconds.
+    BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.checkouts: int = 0
+        self.timeouts: int = 0
+        self.wait_total: float = 0.0
+        self.wait_max: float = 0.0
+        self.histogram: List[int] = [0] * (len(self.BUCKETS) + 1)
+
+    def observe(self, seconds: float) -> None:
+        with self.lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self.histogram[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+
+    def timeout(self) -> None:
+        with self.lock:
+            self.timeouts += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            labels = [f"le_{bound}" for bound in self.BUCKETS] + ["inf"]
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_mean_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "wait_histogram": dict(zip(labels, self.histogram)),
+            }
+
+
+class InstrumentedPoolMixin:
+    """Mixin of the queue pool that measures how long every checkout waits for the
+    connection, including the connect of the new connection, and counts the
+    checkouts that time out. The metrics survive the `recreate` of the pool on
+    `engine.dispose()`.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics: PoolMetrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeout()
+            raise
+        self.metrics.observe(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            **self.metrics.stats(),
+        }
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    ...
+
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    ...
+
+
+def pool_stats(engine: Engine) -> Dict[str, Any]:
+    """Return the stats of the engine pool, or only its status for the pool that is
+    not instrumented, like the pool of the SQLite in-memory database.
+    """
+    if isinstance(engine.pool, InstrumentedPoolMixin):
+        return engine.pool.stats()
+    return {"status": engine.pool.status()}
+
+
+def prewarm(engine: Engine, size: int) -> None:
+    """Open `size` connections at the same time and return them to the pool"""
+    with ExitStack() as stack:
+        for _ in range(size):
+            stack.enter_context(engine.connect())
+
+
+async def prewarm_async(engine: AsyncEngine, size: int) -> None:
+    """Open `size` connections at the same time and return them to the pool"""
+    async with AsyncExitStack() as stack:
+        for _ in range(size):
+            await stack.enter_async_context(engine.connect())
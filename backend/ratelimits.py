@@ -0,0 +1,168 @@
+import math
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from fastapi import HTTPException, Request, status
+from starlette.concurrency import run_in_threadpool
+from .config import settings
+
+
+def consume(
+        tokens: float,
+        updated: float,
+        now: float,
+        capacity: int,
+        period: float,
+) -> Tuple[float, float]:
+    """Refill the token bucket for the elapsed time and take one token from it.
+    Return the tokens that are left in the bucket, and the seconds until the next
+    token if the bucket is empty (zero if the token was taken).
+    """
+    rate = capacity / period
+    tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / rate
+
+
+class MemoryStore:
+    """Token buckets in the memory of this process. The bucket is updated without
+    awaiting, so the concurrent requests of the event loop take the tokens one by one.
+    """
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys: int = max_keys
+        self.buckets: Dict[str, Tuple[float, float]] = {}
+
+    async def take(self, key: str, capacity: int, period: float) -> float:
+        now = time.time()
+        tokens, updated = self.buckets.get(key, (capacity, now))
+        tokens, retry_after = consume(tokens, updated, now, capacity, period)
+        self.buckets[key] = (tokens, now)
+        if len(self.buckets) > self.max_keys:
+            self.prune(now, period)
+        return retry_after
+
+    def prune(self, now: float, period: float) -> None:
+        """Drop the buckets that have been refilled to full"""
+        self.buckets = {
+            key: (tokens, updated) for key, (tokens, updated) in self.buckets.items()
+            if now - updated < period
+        }
+
+
+class SQLiteStore:
+    """Token buckets in the SQLite database, that are shared by all workers on the
+    same host. The bucket is updated in the `BEGIN IMMEDIATE` transaction, so the
+    concurrent workers take the tokens one by one.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self._local = threading.local()
+        with self.connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def connect(self) -> sqlite3.Connection:
+        if (conn := getattr(self._local, "conn", None)) is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _take(self, key: str, capacity: int, period: float) -> float:
+        conn = self.connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated FROM rate_limits WHERE key = ?", (key, )
+            ).fetchone()
+            tokens, updated = row or (capacity, now)
+            tokens, retry_after = consume(tokens, updated, now, capacity, period)
+            conn.execute(
+                "INSERT INTO rate_limits (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return retry_after
+
+    async def take(self, key: str, capacity: int, period: float) -> float:
+        return await run_in_threadpool(self._take, key, capacity, period)
+
+
+store = (
+    SQLiteStore(settings.RATE_LIMIT_STORAGE_PATH)
+    if settings.RATE_LIMIT_STORAGE_PATH else MemoryStore()
+)
+
+
+class RateLimit:
+    """Dependency that limits the requests per client IP and per account with the
+    token buckets. The limited request gets `429 Too Many Requests` with the
+    `Retry-After` header before the handler does any expensive work.
+
+    implemented:
+
+        ..> @router.post('...', dependencies=[Depends(RateLimit('login', ip=(20, 60)))])
+        ... async def login(...):
+        ...     return ...
+
+    """
+
+    def __init__(
+            self,
+            name: str,
+            *,
+            ip: Optional[Tuple[int, float]] = None,
+            account: Optional[Tuple[int, float]] = None,
+            account_field: str = "username",
+    ) -> None:
+        self.name: str = name
+        self.ip = ip
+        self.account = account
+        self.account_field: str = account_field
+
+    async def __call__(self, request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        limits = []
+        if self.ip and request.client:
+            limits.append((f"{self.name}:ip:{request.client.host}", *self.ip))
+        if self.account:
+            form = await request.form()
+            if account := form.get(self.account_field):
+                limits.append((f"{self.name}:account:{str(account).lower()}", *self.account))
+
+        retry_after: float = 0.0
+        for key, capacity, period in limits:
+            retry_after = max(retry_after, await store.take(key, capacity, period))
+        if retry_after > 0:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+
+login_rate_limit = RateLimit(
+    "login",
+    ip=settings.RATE_LIMIT_LOGIN_IP,
+    account=settings.RATE_LIMIT_LOGIN_ACCOUNT,
+    account_field="username",
+)
+
+register_rate_limit = RateLimit(
+    "register",
+    ip=settings.RATE_LIMIT_REGISTER_IP,
+    account=settings.RATE_LIMIT_REGISTER_ACCOUNT,
+    account_field="email",
+)
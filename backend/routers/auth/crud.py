@@ -1,18 +1,17 @@
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..users.models import User
-from ..users.crud import get_user_by_email
-from ...securities import verify_password
+from ...securities import password_service
 
 
-def authenticate(
-        session: Session,
+async def authenticate(
+        session: AsyncSession,
         *,
         email: str,
         password: str,
 ) -> Optional[User]:
-    if user := get_user_by_email(session, email=email):
-        return user if verify_password(password, user.hashed_password) else None
+    if user := await User.read_by_email(session, email):
+        return user if await password_service.verify(password, user.hashed_password) else None
     else:
         return None
 
@@ -1,3 +1,5 @@
+import hashlib
+from typing import Callable, Optional
 from fastapi import (
     Depends,
     HTTPException,
@@ -9,12 +11,13 @@ from fastapi.security import (
 )
 from jose import JWTError, jwt
 from pydantic import ValidationError
-from sqlalchemy.orm import Session
-from ...database import get_session
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from ...database import get_async_session
 from ...securities import ALGORITHM
 from ...config import settings
-from ..users.models import User
-from ..users.crud import get_user, get_user_by_username
+from ...utils.caches import TTLCache
+from ..users.schemas import User
+from ..users.crud import get_principal
 from .schemas import TokenPayload, TokenDataScope
 from .crud import (
     is_active,
@@ -39,46 +42,84 @@ reusable_oauth2 = OAuth2PasswordBearer(
 )
 
 
+# Cache of the decoded and validated claims of the access tokens. The key is the
+# digest of token, so the cache does not keep the bearer tokens in memory, and an
+# entry expires at the `exp` claim of its token.
+token_cache: TTLCache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE)
+
+
+def decode_access_token(token: str) -> TokenDataScope:
+    """Return the validated claims of the access token from the token cache, or
+    decode them with `jwt.decode` if the token was not seen before.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    if token_data := token_cache.get(key):
+        return token_data
+    payload = jwt.decode(
+        token, settings.SECRET_KEY, algorithms=[ALGORITHM]
+    )
+    username = payload.get("sub")
+    if username is None:
+        raise JWTError("Could not find the subject of token")
+    # OAuth2 with scopes
+    token_scopes = payload.get("scopes", [])
+    token_data = TokenDataScope(scopes=token_scopes, username=username)
+    if (expire_at := payload.get("exp")) is not None:
+        token_cache.set(key, token_data, expire_at=float(expire_at))
+    return token_data
+
+
+def get_principal_dependency(scheme: Callable) -> Callable:
+    """Return the dependency that authenticates the current user from the access
+    token of the `scheme` dependency. It is shared by the OAuth2 scopes flow and
+    the cookie-based flow, and it reads the user through the principal cache and
+    the async session, so it does not block the event loop.
+    """
+
+    async def get_current_principal(
+            security_scopes: SecurityScopes,
+            token: str = Depends(scheme),
+            async_session: async_sessionmaker = Depends(get_async_session),
+    ) -> Optional[User]:
+        # OAuth2 with scopes
+        if security_scopes.scopes:
+            authenticate_value = f'Bearer scope="{security_scopes.scope_str}"'
+        else:
+            authenticate_value = "Bearer"
+        try:
+            token_data = decode_access_token(token)
+        except (JWTError, ValidationError) as err:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": authenticate_value},
+            ) from err
+        if user := await get_principal(async_session, username=token_data.username):
+            # OAuth2 with scopes
+            for scope in security_scopes.scopes:
+                if scope not in token_data.scopes:
+                    raise HTTPException(
+                        status_code=status.HTTP_401_UNAUTHORIZED,
+                        detail="Not enough permissions",
+                        headers={"WWW-Authenticate": authenticate_value},
+                    )
+        return user
+
+    return get_current_principal
+
+
 async def get_current_user(
         security_scopes: SecurityScopes,
-        session: Session = Depends(get_session),
-        token: str = Depends(reusable_oauth2),
+        user: Optional[User] = Depends(get_principal_dependency(reusable_oauth2)),
 ) -> User:
-    # OAuth2 with scopes
-    if security_scopes.scopes:
-        authenticate_value = f'Bearer scope="{security_scopes.scope_str}"'
-    else:
-        authenticate_value = "Bearer"
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[ALGORITHM]
-        )
-        username = payload.get("sub")
-        if username is None:
-            raise ValidationError
-        # OAuth2 with scopes
-        token_scopes = payload.get("scopes", [])
-        token_data = TokenDataScope(scopes=token_scopes, username=username)
-    except (JWTError, ValidationError) as err:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": authenticate_value},
-        ) from err
-    if user := get_user_by_username(session, username=token_data.username):
-        # OAuth2 with scopes
-        for scope in security_scopes.scopes:
-            if scope not in token_data.scopes:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Not enough permissions",
-                    headers={"WWW-Authenticate": authenticate_value},
-                )
+    if user:
         return user
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="User not found",
-        headers={"WWW-Authenticate": authenticate_value},
+        headers={"WWW-Authenticate": (
+            f'Bearer scope="{security_scopes.scope_str}"' if security_scopes.scopes else "Bearer"
+        )},
     )
 
 
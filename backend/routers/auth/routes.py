@@ -1,12 +1,14 @@
 from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Body, Depends, HTTPException, status, Security
-from fastapi import BackgroundTasks
 from fastapi.encoders import jsonable_encoder
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from ...database import get_session
-from ...securities import get_password_hash
+from ...database import get_async_session_open
+from ...ratelimits import login_rate_limit
+from ...securities import password_service
 from ...securities import create_access_token
 from ...config import settings
 from ...utils.utilities import (
@@ -17,6 +19,7 @@ from ...utils.utilities import (
 from ..users.schemas import User as SchemaUser
 from ..users.models import User
 from ..users.crud import get_user_by_email
+from ..users.crud import invalidate_principal
 from .crud import authenticate
 from .crud import is_active
 from .dependencies import get_current_user
@@ -29,13 +32,17 @@ auth = APIRouter(
 )
 
 
-@auth.post("/login/access-token", response_model=Token)
-def login_access_token(
-    session: Session = Depends(get_session),
+@auth.post(
+    "/login/access-token",
+    response_model=Token,
+    dependencies=[Depends(login_rate_limit)],
+)
+async def login_access_token(
+    session: AsyncSession = Depends(get_async_session_open),
     form_data: OAuth2PasswordRequestForm = Depends(OAuth2PasswordRequestForm)
 ) -> Any:
     """OAuth2 compatible token login, get an access token for future requests"""
-    user = authenticate(
+    user = await authenticate(
         session,
         email=form_data.username,
         password=form_data.password,
@@ -80,7 +87,6 @@ def test_token(
 @auth.post("/password-recovery/{email}", response_model=Message)
 def recover_password(
         email: str,
-        background_tasks: BackgroundTasks,
         session: Session = Depends(get_session),
 ) -> Any:
     """Password Recovery"""
@@ -92,9 +98,8 @@ def recover_password(
         )
     password_reset_token = generate_password_reset_token(email=email)
 
-    # docs: https://fastapi.tiangolo.com/tutorial/background-tasks/
-    background_tasks.add_task(
-        send_reset_password_email,
+    # The email is queued to the mail queue, that sends it in the background.
+    send_reset_password_email(
         email_to=user.email,
         email=email,
         token=password_reset_token
@@ -103,10 +108,10 @@ def recover_password(
 
 
 @auth.post("/reset-password/", response_model=Message)
-def reset_password(
+async def reset_password(
     token: str = Body(...),
     new_password: str = Body(...),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session_open),
 ) -> Any:
     """Reset password"""
     email = verify_password_reset_token(token)
@@ -114,7 +119,7 @@ def reset_password(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid token"
         )
-    user = get_user_by_email(session, email=email)
+    user = await User.read_by_email(session, email)
     if not user:
         raise HTTPException(
             status_code=404,
@@ -124,8 +129,8 @@ def reset_password(
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
         )
-    hashed_password = get_password_hash(new_password)
+    hashed_password = await password_service.hash(new_password)
     user.hashed_password = hashed_password
-    session.add(user)
-    session.commit()
+    await session.commit()
+    invalidate_principal(user.username)
     return {"msg": "Password updated successfully"}
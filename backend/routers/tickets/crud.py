@@ -1,18 +1,29 @@
+from datetime import datetime
 from fastapi import Depends
 from fastapi import HTTPException
-from typing import AsyncIterator
+from fastapi import status
+from typing import Any, AsyncIterator, List, Optional
 from sqlalchemy.orm import Session
 from .models import Ticket
 from .models import UserTicket
 from .schemas import Ticket as SchemaTicket
 from .schemas import TicketCreate as SchemaTicketCreate
+from .schemas import TicketBase as SchemaTicketBase
 from .schemas import TicketCreateForm
+from ...crud import AsyncRepository
 from ...database import BaseCRUD
+from ...database import BaseReadCRUD
 from ...database import get_async_session
+from ...templating import fragment_cache
+from ...conditional import Validator
+from ...config import settings
+from ...pagination import Page, PageParams
+from ...bulk import BulkItem, BulkResult, bulk_result, validate_items
+from ...search import fts_query
 
-
-def get_tickets(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Ticket).offset(skip).limit(limit).all()
+tickets_repository: AsyncRepository[Ticket] = AsyncRepository(
+    Ticket, keys={"create_at": datetime, "id": int}
+)
 
 
 def create_user_ticket(session: Session, item: SchemaTicketCreate, user_id: int):
@@ -40,45 +51,126 @@ class CreateTicket(BaseCRUD):
             return SchemaTicket.from_orm(ticket_create)
 
 
-class ReadTicket(BaseCRUD):
+class CreateTickets(BaseCRUD):
+    async def execute(self, items: List[Any], session_key: str) -> BulkResult:
+        """Create the valid tickets of the batch with one multi-row INSERT ... RETURNING
+        in one transaction, and return the result of every item.
+        """
+        valid, results = validate_items(SchemaTicketBase, items)
+        if not valid:
+            return bulk_result(results)
+
+        async with self.async_session.begin() as session:
+            created = await tickets_repository.create_many(session, [
+                {"text": ticket.text, "description": ticket.description, "session_key": session_key}
+                for _, ticket in valid
+            ])
+        for (index, _), ticket in zip(valid, created):
+            results.append(
+                BulkItem(index=index, status=status.HTTP_201_CREATED, item=SchemaTicket.from_orm(ticket))
+            )
+        return bulk_result(results)
+
+
+class ReadTicket(BaseReadCRUD):
     async def execute(self, ticket_id: int) -> SchemaTicket:
         async with self.async_session.begin() as session:
-            ticket = await Ticket.read_by_id(session, ticket_id)
+            ticket = await tickets_repository.get(session, ticket_id)
             if not ticket:
                 raise HTTPException(status_code=404)
             return SchemaTicket.from_orm(ticket)
 
+    async def version(self, ticket_id: int, *variant) -> Validator:
+        async with self.async_session.begin() as session:
+            exists, update_at = await Ticket.read_version_by_id(session, ticket_id)
+            if not exists:
+                raise HTTPException(status_code=404)
+            # The row without the update datetime is versioned by its id only, until
+            # its first update.
+            return Validator.build(ticket_id, update_at, *variant, last_modified=update_at)
+
+
+class ListTickets(BaseReadCRUD):
+    async def execute(self, page: PageParams) -> Page[SchemaTicket]:
+        """Return the page of tickets ordered by (create_at, id), that starts after
+        the cursor of the page.
+        """
+        async with self.async_session.begin() as session:
+            tickets, next_cursor = await tickets_repository.list(session, page)
+        return Page[SchemaTicket](
+            items=[SchemaTicket.from_orm(ticket) for ticket in tickets],
+            next_cursor=next_cursor,
+        )
+
+    async def version(self, page: PageParams) -> Validator:
+        async with self.async_session.begin() as session:
+            count, last_id, last_update = await Ticket.read_version(session)
+            return Validator.build(
+                count, last_id, last_update, page.cursor, page.limit, last_modified=last_update
+            )
+
 
-class ReadTickets(BaseCRUD):
+class ReadTickets(BaseReadCRUD):
     async def execute(self, session_key) -> AsyncIterator[SchemaTicket]:
         async with self.async_session.begin() as session:
             async for ticket in Ticket.read_all(session, session_key):
                 yield SchemaTicket.from_orm(ticket)
 
+    async def version(self, session_key, *variant) -> Validator:
+        async with self.async_session.begin() as session:
+            count, last_id, last_update = await Ticket.read_version(session, session_key)
+            return Validator.build(
+                session_key, count, last_id, last_update, *variant, last_modified=last_update
+            )
+
+
+class SearchTickets(BaseReadCRUD):
+    async def execute(
+            self, query: str, page: PageParams, session_key: Optional[str] = None
+    ) -> Page[SchemaTicket]:
+        """Return the page of tickets that match all terms of the query as prefixes,
+        ranked by bm25 with the keyset cursor of `(rank, id)`.
+        """
+        if not (match := fts_query(query)):
+            return Page[SchemaTicket](items=[])
+        async with self.async_session.begin() as session:
+            # Fetch one more row to know if there is the next page.
+            rows = await Ticket.search(
+                session, match, session_key=session_key, after=page.after(float, int), limit=page.limit + 1
+            )
+        rows, next_cursor = page.page(rows, "rank", "id")
+        return Page[SchemaTicket](
+            items=[SchemaTicket.from_orm(row.Ticket) for row in rows],
+            next_cursor=next_cursor,
+        )
+
+
+class StreamTickets(BaseReadCRUD):
+    async def execute(self) -> AsyncIterator[list[SchemaTicket]]:
+        async with self.async_session.begin() as session:
+            async for tickets in Ticket.stream_all(session, settings.STREAM_BATCH_SIZE):
+                yield [SchemaTicket.from_orm(ticket) for ticket in tickets]
+
 
 class UpdateTicket(BaseCRUD):
     async def execute(self, ticket_id: int, ticket: TicketCreateForm) -> SchemaTicket:
         async with self.async_session.begin() as session:
-            _ticket = await Ticket.read_by_id(session, ticket_id)
+            _ticket = await tickets_repository.update(
+                session, ticket_id, {"text": ticket.text, "description": ticket.description}
+            )
             if not _ticket:
                 raise HTTPException(status_code=404)
-
-            _ticket.text = ticket.text
-            _ticket.description = ticket.description
-
-            await session.flush()
-            await session.refresh(_ticket)
+            fragment_cache.invalidate(("ticket", ticket_id))
             return SchemaTicket.from_orm(_ticket)
 
 
 class DeleteTicket(BaseCRUD):
     async def execute(self, ticket_id: int):
         async with self.async_session.begin() as session:
-            ticket = await Ticket.read_by_id(session, ticket_id)
+            ticket = await tickets_repository.delete(session, ticket_id)
             if not ticket:
                 raise HTTPException(status_code=404)
-            await session.delete(ticket)
-            await session.flush()
+            fragment_cache.invalidate(("ticket", ticket_id))
             return SchemaTicket.from_orm(ticket)
 
 
@@ -9,10 +9,21 @@ from sqlalchemy import (
     String,
     DateTime,
     ForeignKey,
-    select
+    Index,
+    and_,
+    column,
+    literal_column,
+    or_,
+    select,
+    func,
+    table,
 )
+from sqlalchemy.engine import Row
 from ...database import Base
 
+# The FTS5 index of tickets, that is created by the schema revision 3.
+tickets_fts = table("tickets_fts", column("rowid"), column("rank"))
+
 
 class Ticket(Base):
     """Ticket model"""
@@ -22,8 +33,14 @@ class Ticket(Base):
     text = Column(String, index=True)
     description = Column(String, index=True)
     session_key = Column(String, index=True)
-    create_at = Column(DateTime, default=datetime.now)
-    update_at = Column(DateTime, default=datetime.now)
+    # The sort key of the keyset pagination is NOT NULL since the schema revision 5.
+    create_at = Column(DateTime, nullable=False, default=datetime.now)
+    update_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        # The sort key of the keyset pagination.
+        Index("tickets_create_at_id_idx", "create_at", "id"),
+    )
 
     @classmethod
     async def read_all(cls, session: AsyncSession, session_key: str) -> AsyncIterator['Ticket']:
@@ -34,12 +51,76 @@ class Ticket(Base):
         async for row in stream:
             yield row.Ticket
 
+    @classmethod
+    async def stream_all(cls, session: AsyncSession, batch_size: int = 500) -> AsyncIterator[list['Ticket']]:
+        """Return all tickets ordered by (create_at, id) in the batches, that are
+        fetched from the database cursor `batch_size` rows at a time.
+        """
+        stmt = (
+            select(cls)
+            .order_by(cls.create_at, cls.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await session.stream_scalars(stmt)
+        async for tickets in result.partitions():
+            yield tickets
+
     @classmethod
     async def read_by_id(cls, session: AsyncSession, ticket_id: int) -> Optional['Ticket']:
         stmt = select(cls).where(cls.id == ticket_id)
         result = (await session.execute(stmt.order_by(cls.id))).first()
         return result.Ticket if result else None
 
+    @classmethod
+    async def read_version(cls, session: AsyncSession, session_key: Optional[str] = None) -> tuple:
+        """Return the row count, the max id and the max update datetime of tickets
+        in this session key, or of all tickets, for use as the cache validator of
+        the list.
+        """
+        stmt = select(func.count(cls.id), func.max(cls.id), func.max(cls.update_at))
+        if session_key is not None:
+            stmt = stmt.where(cls.session_key == session_key)
+        return tuple((await session.execute(stmt)).one())
+
+    @classmethod
+    async def search(
+            cls,
+            session: AsyncSession,
+            query: str,
+            *,
+            session_key: Optional[str] = None,
+            after: Optional[tuple] = None,
+            limit: int = 50,
+    ) -> list[Row]:
+        """Return the rows of (Ticket, rank, id) that match the FTS5 query ordered by
+        the bm25 rank, the best first, and by id, that start after the `(rank, id)`
+        of the previous page.
+        """
+        rank = tickets_fts.c.rank
+        stmt = (
+            select(cls, rank.label("rank"), cls.id.label("id"))
+            .join(tickets_fts, tickets_fts.c.rowid == cls.id)
+            .where(literal_column(tickets_fts.name).op("MATCH")(query))
+        )
+        if session_key is not None:
+            stmt = stmt.where(cls.session_key == session_key)
+        if after is not None:
+            after_rank, after_id = after
+            stmt = stmt.where(or_(rank > after_rank, and_(rank == after_rank, cls.id > after_id)))
+        return (await session.execute(stmt.order_by(rank, cls.id).limit(limit))).all()
+
+    @classmethod
+    async def read_version_by_id(
+            cls, session: AsyncSession, ticket_id: int
+    ) -> tuple[bool, Optional[datetime]]:
+        """Return whether the ticket exists, and its update datetime, without loading
+        the whole row. The update datetime is None for the row that was never updated
+        since the legacy schema.
+        """
+        stmt = select(cls.update_at).where(cls.id == ticket_id)
+        result = (await session.execute(stmt)).first()
+        return (True, result.update_at) if result else (False, None)
+
 
 class UserTicket(Base):
     """User's ticket model"""
@@ -1,11 +1,20 @@
+from typing import Any, List
 from fastapi import APIRouter
+from fastapi import Body
 from fastapi import Depends
-from sqlalchemy.orm import Session
+from fastapi import Query
+from fastapi import Response
 from .schemas import Ticket as SchemaTicket
 from .schemas import TicketCreateForm
-from .crud import get_tickets
 from .crud import CreateTicket
-from ...database import get_session
+from .crud import CreateTickets
+from .crud import ListTickets
+from .crud import StreamTickets
+from .crud import SearchTickets
+from ...conditional import ConditionalRequest
+from ...pagination import Page, PageParams
+from ...bulk import BulkResult
+from ...streaming import NDJSON_MEDIA_TYPE, StreamFormat
 
 
 tickets = APIRouter(
@@ -17,13 +26,36 @@ tickets = APIRouter(
 )
 
 
-@tickets.get("/", response_model=list[SchemaTicket])
-def read_all(
-        skip: int = 0,
-        limit: int = 100,
-        session: Session = Depends(get_session)
+@tickets.get(
+    "/",
+    response_model=Page[SchemaTicket],
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
+async def read_all(
+        response: Response,
+        page: PageParams = Depends(PageParams),
+        stream: StreamFormat = Depends(StreamFormat),
+        stream_service: StreamTickets = Depends(StreamTickets),
+        service: ListTickets = Depends(ListTickets),
+        conditional: ConditionalRequest = Depends(ConditionalRequest),
 ):
-    return get_tickets(session, skip=skip, limit=limit)
+    if stream:
+        return stream.response(stream_service.execute())
+    validator = await service.version(page)
+    if not_modified := conditional.evaluate(validator):
+        return not_modified
+    validator.apply(response)
+    return await service.execute(page)
+
+
+@tickets.get("/search", response_model=Page[SchemaTicket])
+async def search(
+        q: str = Query(..., min_length=1, max_length=200, description="The terms to search"),
+        page: PageParams = Depends(PageParams),
+        service: SearchTickets = Depends(SearchTickets),
+) -> Page[SchemaTicket]:
+    """Full-text search of tickets ranked by relevance"""
+    return await service.execute(q, page)
 
 
 @tickets.post("/", response_model=SchemaTicket)
@@ -33,3 +65,12 @@ async def create(
 ) -> SchemaTicket:
     """CRUD of user"""
     return await service.execute(user, session_key='')
+
+
+@tickets.post("/bulk", response_model=BulkResult[SchemaTicket])
+async def create_bulk(
+    items: List[Any] = Body(..., description="The tickets to create"),
+    service: CreateTickets = Depends(CreateTickets),
+) -> BulkResult[SchemaTicket]:
+    """Create the batch of tickets, and return the result of every item"""
+    return await service.execute(items, session_key='')
@@ -1,5 +1,6 @@
+from datetime import datetime
 from fastapi import Form
-from typing import Union
+from typing import Optional, Union
 from pydantic import BaseModel
 
 
@@ -15,6 +16,7 @@ class TicketCreate(TicketBase):
 class Ticket(TicketBase):
     id: int
     session_key: str
+    update_at: Optional[datetime] = None
 
     class Config:
         orm_mode = True
@@ -2,12 +2,15 @@ import uuid
 from fastapi import APIRouter
 from fastapi import Depends
 from fastapi import Cookie
+from fastapi import Query
 from fastapi import Request
+from fastapi import Response
 from fastapi.responses import PlainTextResponse
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from .crud import ReadTicket
 from .crud import ReadTickets
+from .crud import SearchTickets
 from .crud import CreateTicket
 from .crud import UpdateTicket
 from .crud import DeleteTicket
@@ -15,6 +18,13 @@ from .schemas import Ticket as SchemaTicket
 from .schemas import TicketCreateForm
 from ..users.dependencies import get_current_user_optional
 from ...dependencies import get_templates
+from ...dependencies import get_engine
+from ...templating import TemplateEngine
+from ...templating import is_htmx
+from ...conditional import ConditionalRequest
+from ...config import settings
+from ...pagination import PageParams
+from ...search import Debouncer
 
 tickets = APIRouter(
     tags=["ticket-views"],
@@ -29,39 +39,91 @@ tickets = APIRouter(
 async def ticket_read(
         request: Request,
         session_key: str = Cookie(default=uuid.uuid4().hex),
-        template: Jinja2Templates = Depends(get_templates),
+        engine: TemplateEngine = Depends(get_engine),
         service: ReadTickets = Depends(ReadTickets),
+        conditional: ConditionalRequest = Depends(ConditionalRequest),
         # current_user=Depends(get_current_user_optional),
 ):
     # print(f"Current user: {current_user}")
-    _tickets = service.execute(session_key)
+    validator = await service.version(
+        session_key,
+        engine.version,
+        request.base_url,
+        is_htmx(request),
+        request.headers.get("HX-Target"),
+    )
+    if response := conditional.evaluate(validator):
+        return response
     context = {
         "request": request,
-        "tickets": [ticket async for ticket in _tickets],
+
+        # Pass the async generator to the template, the tickets are rendered while
+        # their rows come from the database stream.
+        "tickets": service.execute(session_key),
         "title": "Home"
     }
     request.session['session_value'] = session_key
-    response = template.TemplateResponse("tickets/index.html", context)
+    response = engine.render(request, "tickets/index.html", context, block="content", stream=True)
     response.set_cookie(
         key="session_key",
         value=session_key,
         expires=(60 * 60 * 24 * 3),
         secure=True,
     )
-    return response
+    return validator.apply(response)
+
+
+# The keystrokes of the search box of one session, that is superseded by the newer
+# keystroke while it waits, are answered with `204 No Content` without the query.
+search_debouncer: Debouncer = Debouncer(settings.SEARCH_DEBOUNCE_SECONDS)
+
+
+@tickets.get("/search", response_class=HTMLResponse)
+async def ticket_search(
+        request: Request,
+        q: str = Query("", max_length=200),
+        session_key: str = Cookie(default=""),
+        page: PageParams = Depends(PageParams),
+        engine: TemplateEngine = Depends(get_engine),
+        service: SearchTickets = Depends(SearchTickets),
+        list_service: ReadTickets = Depends(ReadTickets),
+):
+    """Return the ticket fragments that match the search box of this session, or
+    all tickets of the session for the empty search box.
+    """
+    # The clients without the session cookie share no key to debounce by, so their
+    # searches are not debounced instead of superseding the searches of each other.
+    if session_key and not await search_debouncer.wait(session_key):
+        return Response(status_code=204)
+    if q.strip():
+        tickets = (await service.execute(q, page, session_key=session_key)).items
+    else:
+        tickets = [ticket async for ticket in list_service.execute(session_key)]
+    return HTMLResponse("".join(
+        engine.render_fragment(
+            "tickets/partials/ticket.html", {"request": request, "ticket": ticket},
+            key=("ticket", ticket.id), version=ticket.update_at,
+        )
+        for ticket in tickets
+    ))
 
 
 @tickets.post("/", response_class=HTMLResponse)
 async def ticket_create(
         request: Request,
         ticket: TicketCreateForm = Depends(TicketCreateForm.as_form),
-        template: Jinja2Templates = Depends(get_templates),
+        engine: TemplateEngine = Depends(get_engine),
         service: CreateTicket = Depends(CreateTicket),
 ):
     session_key = request.cookies.get("session_key")
     ticket: SchemaTicket = await service.execute(ticket=ticket, session_key=session_key)
     context = {"request": request, "ticket": ticket}
-    return template.TemplateResponse("tickets/partials/ticket.html", context)
+    return HTMLResponse(
+        engine.render_fragment(
+            "tickets/partials/ticket.html", context,
+            key=("ticket", ticket.id), version=ticket.update_at,
+        )
+    )
 
 
 @tickets.get("/{item_id}/", response_class=HTMLResponse)
@@ -69,11 +131,18 @@ async def ticket_update(
         request: Request,
         item_id: int,
         template: Jinja2Templates = Depends(get_templates),
+        engine: TemplateEngine = Depends(get_engine),
         service: ReadTicket = Depends(ReadTicket),
+        conditional: ConditionalRequest = Depends(ConditionalRequest),
 ):
+    validator = await service.version(item_id, engine.version, request.base_url)
+    if response := conditional.evaluate(validator):
+        return response
     ticket = await service.execute(item_id)
     context = {"request": request, "ticket": ticket}
-    return template.TemplateResponse("tickets/partials/ticket_edit.html", context)
+    return validator.apply(
+        template.TemplateResponse("tickets/partials/ticket_edit.html", context)
+    )
 
 
 @tickets.put("/{item_id}/", response_class=HTMLResponse)
@@ -81,12 +150,17 @@ async def ticket_update(
         request: Request,
         item_id: int,
         ticket: TicketCreateForm = Depends(TicketCreateForm.as_form),
-        template: Jinja2Templates = Depends(get_templates),
+        engine: TemplateEngine = Depends(get_engine),
         service: UpdateTicket = Depends(UpdateTicket),
 ):
     ticket = await service.execute(item_id, ticket)
     context = {"request": request, "ticket": ticket}
-    return template.TemplateResponse("tickets/partials/ticket.html", context)
+    return HTMLResponse(
+        engine.render_fragment(
+            "tickets/partials/ticket.html", context,
+            key=("ticket", ticket.id), version=ticket.update_at,
+        )
+    )
 
 
 @tickets.delete("/{item_id}/", response_class=PlainTextResponse)
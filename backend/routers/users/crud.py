@@ -1,12 +1,23 @@
-from fastapi import Depends, HTTPException
+import asyncio
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import AsyncIterator, Union, Type, List, Optional
+from typing import Any, AsyncIterator, Union, Type, List, Optional
 from .models import User
+from ..tickets.models import UserTicket
+from ...crud import AsyncRepository
 from ...database import get_async_session
+from ...database import get_async_read_session
 from ...database import BaseCRUD
-from ...securities import get_password_hash
-from ...securities import verify_password
+from ...database import BaseReadCRUD
+from ...securities import password_service
+from ...conditional import Validator
+from ...pagination import Page, PageParams
+from ...bulk import BulkItem, BulkResult, bulk_result, validate_items
+from ...config import settings
+from ...utils.caches import TTLCache, MISSING
 from .schemas import User as SchemaUser
 from .schemas import UserCreate as SchemaUserCreate
 from .schemas import UserUpdate as SchemaUserUpdate
@@ -33,16 +44,70 @@ def get_users(session: Session, skip: int = 0, limit: int = 100) -> list[Type[Us
     return session.query(User).offset(skip).limit(limit).all()
 
 
+users_repository: AsyncRepository[User] = AsyncRepository(User, keys={"id": int})
+
+
+"""
+the Cache of authenticated user principals.
+"""
+
+# The principal is the snapshot of user without the password hash. The unknown
+# usernames are cached as None for the shorter time. An entry is invalidated by
+# the services that change the user in this process, and the TTL limits how long
+# the changes from other workers are not visible.
+principal_cache: TTLCache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+)
+
+
+async def get_principal(async_session: sessionmaker, username: str) -> Optional[SchemaUser]:
+    if (principal := principal_cache.get(username, MISSING)) is not MISSING:
+        return principal
+    async with async_session.begin() as session:
+        user = await User.read_by_username(session, username)
+        principal = SchemaUser.from_orm(user) if user else None
+    principal_cache.set(
+        username,
+        principal,
+        ttl=(None if principal else settings.PRINCIPAL_CACHE_NEGATIVE_TTL),
+    )
+    return principal
+
+
+def invalidate_principal(*usernames: str, user_id: Optional[int] = None) -> None:
+    """Drop the cached principals of the changed users. It is called after the commit,
+    because the request that reads the user before the commit would cache the old
+    row again for the TTL.
+    """
+    for username in usernames:
+        principal_cache.pop(username)
+    if user_id is not None:
+        # The renamed user is still cached by the old username, that is not known
+        # to the service after `UPDATE ... RETURNING`.
+        principal_cache.pop_if(lambda _, principal: principal is not None and principal.id == user_id)
+
+
 """
 the Asynchronous CRUD classes for get any models from database.
 """
 
 
-class ReadUsers(BaseCRUD):
-    async def execute(self, skip: int = 0, limit: int = 100) -> AsyncIterator[SchemaUser]:
+class ReadUsers(BaseReadCRUD):
+    async def execute(self, page: PageParams) -> Page[SchemaUser]:
         async with self.async_session.begin() as session:
-            async for user in User.get_all(session, skip, limit):
-                yield SchemaUser.from_orm(user)
+            users, next_cursor = await users_repository.list(session, page)
+        return Page[SchemaUser](
+            items=[SchemaUser.from_orm(user) for user in users],
+            next_cursor=next_cursor,
+        )
+
+
+class StreamUsers(BaseReadCRUD):
+    async def execute(self) -> AsyncIterator[list[SchemaUser]]:
+        async with self.async_session.begin() as session:
+            async for users in User.stream_all(session, settings.STREAM_BATCH_SIZE):
+                yield [SchemaUser.from_orm(user) for user in users]
 
 
 class CreateUser(BaseCRUD):
@@ -55,7 +120,7 @@ class CreateUser(BaseCRUD):
             if _user:
                 raise HTTPException(status_code=409)
 
-            hashed_password = get_password_hash(user.password)
+            hashed_password = await password_service.hash(user.password)
             _user_create: User = User(
                 email=user.email,
                 username=user.username,
@@ -76,20 +141,79 @@ class CreateUser(BaseCRUD):
             # persisted some changes for an object to the database and need to use this updated
             # object within the same method.
             await session.refresh(_user_create)
-            return SchemaUser.from_orm(_user_create)
+            created = SchemaUser.from_orm(_user_create)
+        invalidate_principal(user.username)
+        return created
+
+
+class CreateUsers(BaseCRUD):
+    async def execute(self, items: List[Any]) -> BulkResult:
+        """Create the valid users of the batch with one multi-row INSERT ... RETURNING
+        in one transaction, and return the result of every item.
+        """
+        valid, results = validate_items(SchemaUserCreate, items)
+
+        # The later item that repeats the username or email of the earlier item, or
+        # of the existing user, conflicts with it.
+        async with self.async_session.begin() as session:
+            usernames, emails = await User.read_existing(
+                session, [user.username for _, user in valid], [user.email for _, user in valid]
+            )
+        users = []
+        for index, user in valid:
+            if user.username in usernames or user.email in emails:
+                results.append(
+                    BulkItem(index=index, status=status.HTTP_409_CONFLICT, errors=["Username or email already exists"])
+                )
+                continue
+            usernames.add(user.username)
+            emails.add(user.email)
+            users.append((index, user))
+        if not users:
+            return bulk_result(results)
+
+        # Hash the passwords in parallel on the process pool of the password service
+        # before opening the write transaction.
+        hashed_passwords = await asyncio.gather(
+            *(password_service.hash(user.password) for _, user in users)
+        )
+        try:
+            async with self.async_session.begin() as session:
+                created = await users_repository.create_many(session, [
+                    {"email": user.email, "username": user.username, "hashed_password": hashed_password}
+                    for (_, user), hashed_password in zip(users, hashed_passwords)
+                ])
+        except IntegrityError:
+            # The other request created the same username or email in the meantime.
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT)
+        for (index, user), _user in zip(users, created):
+            invalidate_principal(user.username)
+            results.append(
+                BulkItem(index=index, status=status.HTTP_201_CREATED, item=SchemaUser.from_orm(_user))
+            )
+        return bulk_result(results)
 
 
 class ReadUser:
-    def __init__(self, session: sessionmaker = Depends(get_async_session)) -> None:
+    def __init__(self, session: sessionmaker = Depends(get_async_read_session)) -> None:
         self.async_session = session
 
     async def execute(self, user_id: int) -> SchemaUser:
         async with self.async_session.begin() as session:
-            user = await User.read_by_id(session, user_id)
+            user = await users_repository.get(session, user_id)
             if not user:
                 raise HTTPException(status_code=404)
             return SchemaUser.from_orm(user)
 
+    async def version(self, user_id: int) -> Validator:
+        async with self.async_session.begin() as session:
+            exists, update_at = await User.read_version_by_id(session, user_id)
+            if not exists:
+                raise HTTPException(status_code=404)
+            # The row without the update datetime is versioned by its id only, until
+            # its first update.
+            return Validator.build(user_id, update_at, last_modified=update_at)
+
 
 class UpdateUser:
     def __init__(self, session: sessionmaker = Depends(get_async_session)) -> None:
@@ -97,16 +221,14 @@ class UpdateUser:
 
     async def execute(self, user_id: int, user: SchemaUserUpdate) -> SchemaUser:
         async with self.async_session.begin() as session:
-            _user = await User.read_by_id(session, user_id)
+            _user = await users_repository.update(
+                session, user_id, {"username": user.username, "email": user.email}
+            )
             if not _user:
                 raise HTTPException(status_code=404)
-
-            _user.username = user.username
-            _user.email = user.email
-
-            await session.flush()
-            await session.refresh(_user)
-            return SchemaUser.from_orm(_user)
+            updated = SchemaUser.from_orm(_user)
+        invalidate_principal(user.username, user_id=user_id)
+        return updated
 
 
 class DeleteUser:
@@ -115,10 +237,16 @@ class DeleteUser:
 
     async def execute(self, user_id: int):
         async with self.async_session.begin() as session:
-            user = await User.read_by_id(session, user_id)
+            # Delete the tickets of user explicitly, because the ORM cascade of the
+            # relationship does not apply to the bulk DELETE statement.
+            await session.execute(
+                delete(UserTicket)
+                .where(UserTicket.owner_id == user_id)
+                .execution_options(synchronize_session=False)
+            )
+            user = await users_repository.delete(session, user_id)
             if not user:
                 raise HTTPException(status_code=404)
-
-            await session.delete(user)
-            await session.flush()
-            return SchemaUser.from_orm(user)
+            deleted = SchemaUser.from_orm(user)
+        invalidate_principal(deleted.username, user_id=user_id)
+        return deleted
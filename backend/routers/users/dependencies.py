@@ -2,16 +2,9 @@ from fastapi import Header, HTTPException, Depends, status, Request
 from fastapi import Cookie
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.security.utils import get_authorization_scheme_param
-from jose import jwt, JWTError
-from sqlalchemy.orm import Session
-from pydantic import ValidationError
 from typing import Optional, List
-from ...config import settings
-from ...securities import ALGORITHM
-from ...database import get_session
-from ..auth.schemas import TokenData
-from .crud import get_user_by_username
-from .models import User
+from ..auth.dependencies import get_principal_dependency
+from .schemas import User
 
 
 # docs: https://nilsdebruin.medium.com/fastapi-how-to-add-basic-and-cookie-authentication-a45c85ef47d3
@@ -64,30 +57,12 @@ oauth2_scheme = OAuth2PasswordCustom(
 )
 
 
-async def get_current_user(
-        token: str = Depends(oauth2_scheme),
-        session: Session = Depends(get_session),
-) -> Optional[User]:
-    try:
-        payload = jwt.decode(
-            token,
-            settings.SECRET_KEY,
-            algorithms=[ALGORITHM]
-        )
-        username = payload.get("sub")
-        if username is None:
-            raise ValidationError
-        token_data = TokenData(username=username)
-    except (JWTError, ValidationError) as err:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        ) from err
-    return get_user_by_username(session, username=token_data.username)
+# The cookie-based flow uses the same dependency as the OAuth2 scopes flow with the
+# different token scheme.
+get_current_user = get_principal_dependency(oauth2_scheme)
 
 
-def get_current_user_required(
+async def get_current_user_required(
     user: Optional[User] = Depends(get_current_user)
 ) -> Optional[User]:
     if not user:
@@ -100,7 +75,7 @@ def get_current_user_required(
     return user
 
 
-def get_current_user_optional(
+async def get_current_user_optional(
     user: Optional[User] = Depends(get_current_user)
 ) -> Optional[User]:
     return user
@@ -1,5 +1,6 @@
 from typing import AsyncIterator
 from typing import Optional
+from datetime import datetime
 from sqlalchemy.orm import relationship, selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import (
@@ -7,6 +8,8 @@ from sqlalchemy import (
     Integer,
     String,
     Boolean,
+    DateTime,
+    or_,
     select
 )
 from ...database import Base
@@ -22,6 +25,8 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
     is_superuser = Column(Boolean, default=False)
+    create_at = Column(DateTime, default=datetime.now)
+    update_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
     # Create role inline for user.
     # role = Column(String, nullable=True, default='user')
@@ -48,6 +53,13 @@ class User(Base):
         result = (await session.execute(stmt.order_by(cls.id))).first()
         return result.User if result else None
 
+    @classmethod
+    async def read_by_email(cls, session: AsyncSession, email: str) -> Optional['User']:
+        """Return User that filter by email"""
+        stmt = select(cls).where(cls.email == email)
+        result = (await session.execute(stmt.order_by(cls.id))).first()
+        return result.User if result else None
+
     @classmethod
     async def read_by_id(
             cls, session: AsyncSession,
@@ -60,19 +72,59 @@ class User(Base):
         result = (await session.execute(stmt.order_by(cls.id))).first()
         return result.User if result else None
 
+    @classmethod
+    async def read_existing(
+            cls,
+            session: AsyncSession,
+            usernames: list[str],
+            emails: list[str],
+    ) -> tuple[set[str], set[str]]:
+        """Return the usernames and the emails of the arguments, that already exist"""
+        stmt = select(cls.username, cls.email).where(
+            or_(cls.username.in_(usernames), cls.email.in_(emails))
+        )
+        rows = (await session.execute(stmt)).all()
+        return {row.username for row in rows}, {row.email for row in rows}
+
+    @classmethod
+    async def read_version_by_id(
+            cls, session: AsyncSession, user_id: int
+    ) -> tuple[bool, Optional[datetime]]:
+        """Return whether the user exists, and its update datetime, without loading
+        the whole row. The update datetime is None for the row that was never updated
+        since the legacy schema.
+        """
+        stmt = select(cls.update_at).where(cls.id == user_id)
+        result = (await session.execute(stmt)).first()
+        return (True, result.update_at) if result else (False, None)
+
     @classmethod
     async def get_all(
             cls,
             session: AsyncSession,
-            skip: int = 0,
+            after_id: Optional[int] = None,
             limit: int = 100,
             include_tickets: bool = False,
     ) -> AsyncIterator['User']:
+        """Return the page of users ordered by id, that starts after `after_id`. The
+        keyset condition uses the primary key index, so every page costs the same
+        at any depth, unlike the offset.
+        """
         stmt = select(cls)
         if include_tickets:
             stmt = stmt.options(selectinload(cls.tickets))
-        if skip > 0 and limit > 0:
-            stmt = stmt.offset(skip).limit(limit)
-        stream = await session.stream(stmt.order_by(cls.id))
+        if after_id is not None:
+            stmt = stmt.where(cls.id > after_id)
+        stream = await session.stream(stmt.order_by(cls.id).limit(limit))
         async for row in stream:
             yield row.User
+
+    @classmethod
+    async def stream_all(cls, session: AsyncSession, batch_size: int = 500) -> AsyncIterator[list['User']]:
+        """Return all users ordered by id in the batches, that are fetched from the
+        database cursor `batch_size` rows at a time.
+        """
+        stmt = select(cls).order_by(cls.id).execution_options(yield_per=batch_size)
+        result = await session.stream_scalars(stmt)
+        async for users in result.partitions():
+            yield users
@@ -1,18 +1,27 @@
+from typing import Any, List
 from fastapi import APIRouter
+from fastapi import Body
 from fastapi import Depends
 from fastapi import Path
+from fastapi import Response
 from fastapi import status
 from .schemas import User as SchemaUser
 from .schemas import UserCreate as SchemaUserCreate
 from .schemas import UserUpdate as SchemaUserUpdate
 from .crud import ReadUsers
+from .crud import StreamUsers
 from .crud import ReadUser
 from .crud import CreateUser
+from .crud import CreateUsers
 from .crud import UpdateUser
 from .crud import DeleteUser
 from ..tickets.schemas import Ticket as SchemaTicket
 from ..tickets.schemas import TicketCreate as SchemaTicketCreate
 from ..tickets.crud import CreateUserTicket
+from ...conditional import ConditionalRequest
+from ...pagination import Page, PageParams
+from ...bulk import BulkResult
+from ...streaming import NDJSON_MEDIA_TYPE, StreamFormat
 
 
 users = APIRouter(
@@ -24,14 +33,21 @@ users = APIRouter(
 )
 
 
-@users.get("/", response_model=list[SchemaUser])
+@users.get(
+    "/",
+    response_model=Page[SchemaUser],
+    responses={status.HTTP_200_OK: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+)
 async def read_all(
-    skip: int = 0,
-    limit: int = 100,
+    page: PageParams = Depends(PageParams),
+    stream: StreamFormat = Depends(StreamFormat),
     service: ReadUsers = Depends(ReadUsers),
+    stream_service: StreamUsers = Depends(StreamUsers),
 ):
     """CRUD of user"""
-    return [user async for user in service.execute(skip=skip, limit=limit)]
+    if stream:
+        return stream.response(stream_service.execute())
+    return await service.execute(page)
 
 
 @users.post("/", response_model=SchemaUser)
@@ -44,6 +60,15 @@ async def create(
     return user
 
 
+@users.post("/bulk", response_model=BulkResult[SchemaUser])
+async def create_bulk(
+    items: List[Any] = Body(..., description="The users to create"),
+    service: CreateUsers = Depends(CreateUsers),
+) -> BulkResult[SchemaUser]:
+    """Create the batch of users, and return the result of every item"""
+    return await service.execute(items)
+
+
 @users.put("/{user_id}", response_model=SchemaUser)
 async def update(
     user: SchemaUserUpdate,
@@ -65,10 +90,16 @@ async def delete(
 
 @users.get("/{user_id}", response_model=SchemaUser)
 async def read(
+    response: Response,
     user_id: int = Path(title="The ID of the user to get", ge=1),
     service: ReadUser = Depends(ReadUser),
+    conditional: ConditionalRequest = Depends(ConditionalRequest),
 ):
     """CRUD of user"""
+    validator = await service.version(user_id)
+    if not_modified := conditional.evaluate(validator):
+        return not_modified
+    validator.apply(response)
     return await service.execute(user_id)
 
 
@@ -1,15 +1,16 @@
 from datetime import timedelta
-from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi import Request
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import RedirectResponse, Response
 from .crud import CreateUser
-from sqlalchemy.orm import Session
-from ...dependencies import get_templates
-from ...database import get_session
+from sqlalchemy.ext.asyncio import AsyncSession
+from ...dependencies import get_engine
+from ...templating import TemplateEngine
+from ...database import get_async_session_open
 from ...config import settings
+from ...ratelimits import login_rate_limit, register_rate_limit
 from ...securities import create_access_token
 from ...utils.utilities import send_new_account_email
 from ..auth.crud import authenticate
@@ -26,13 +27,13 @@ users = APIRouter(
 @users.get('/register/', response_class=HTMLResponse)
 def register(
         request: Request,
-        template: Jinja2Templates = Depends(get_templates),
+        engine: TemplateEngine = Depends(get_engine),
 ):
     context = {"request": request, "content": "register"}
-    return template.TemplateResponse('users/index.html', context=context)
+    return engine.render(request, 'users/index.html', context, block='content')
 
 
-@users.post("/register/")
+@users.post("/register/", dependencies=[Depends(register_rate_limit)])
 async def register(
         response: Response,
         user: UserCreateForm = Depends(UserCreateForm.as_form),
@@ -53,23 +54,28 @@ async def register(
 @users.get('/login/', response_class=HTMLResponse)
 def login(
         request: Request,
-        template: Jinja2Templates = Depends(get_templates),
+        engine: TemplateEngine = Depends(get_engine),
 ):
     context = {"request": request, "content": "login"}
-    return template.TemplateResponse('users/index.html', context=context)
+    return engine.render(request, 'users/index.html', context, block='content')
 
 
-@users.post('/login/')
+@users.post('/login/', dependencies=[Depends(login_rate_limit)])
 async def login(
     response: Response,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session_open),
     form_data: OAuth2PasswordRequestForm = Depends(OAuth2PasswordRequestForm),
 ):
-    user = authenticate(
+    user = await authenticate(
         session,
         email=form_data.username,
         password=form_data.password,
     )
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+        )
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         subject={
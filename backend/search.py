@@ -0,0 +1,53 @@
+import asyncio
+import re
+from typing import Dict, Hashable, Optional
+
+# The terms of the search box are the runs of the word characters, so the FTS5
+# query syntax, like quotes, `NEAR` or `:`, in the user input is not interpreted.
+TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_query(query: str, *, max_terms: int = 8) -> Optional[str]:
+    """Return the FTS5 query that matches the rows with every term of the search
+    box as the prefix, or None if there is no term to search.
+
+    usages:
+
+        ..> fts_query('fix log-in')
+        '"fix"* "log"* "in"*'
+
+    """
+    terms = TERM_PATTERN.findall(query)[:max_terms]
+    return " ".join(f'"{term}"*' for term in terms) or None
+
+
+class Debouncer:
+    """Server-side debounce of the requests by the key of the client, like the
+    session key of the search box. Every request takes the next sequence number of
+    its key and waits for the delay; the request that is superseded by the newer
+    request of the same key in the meantime is not executed.
+
+    usages:
+
+        ..> if not await debouncer.wait(session_key):
+        ...     return Response(status_code=204)
+
+    """
+
+    def __init__(self, delay: float) -> None:
+        self.delay: float = delay
+
+        # The last sequence number of the key, that is kept only while its latest
+        # request is waiting.
+        self.sequences: Dict[Hashable, int] = {}
+        self.superseded: int = 0
+
+    async def wait(self, key: Hashable) -> bool:
+        """Return False if the newer request of the key arrives during the delay"""
+        sequence = self.sequences[key] = self.sequences.get(key, 0) + 1
+        await asyncio.sleep(self.delay)
+        if self.sequences.get(key) != sequence:
+            self.superseded += 1
+            return False
+        del self.sequences[key]
+        return True
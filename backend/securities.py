@@ -1,5 +1,8 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Union
+from typing import Any, Callable, Dict, Optional, Union
 from passlib.context import CryptContext
 from jose import jwt
 from .config import settings
@@ -37,3 +40,99 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+class PasswordService:
+    """Async password service that runs the bcrypt hashing and verification in the
+    process pool, so they do not block the event loop of this worker. The number
+    of operations that wait for, or run in, the pool is capped by `concurrency`.
+
+    usages:
+
+        ..> hashed_password = await password_service.hash('password')
+        ... await password_service.verify('password', hashed_password)
+        True
+
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, concurrency: int = 4) -> None:
+        self.max_workers: Optional[int] = max_workers
+        self.concurrency: int = concurrency
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.waiting: int = 0
+        self.max_waiting: int = 0
+        self.running: int = 0
+        self.completed: int = 0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            # The workers are started by the fork server instead of the fork of this
+            # process, which has the running event loop, the threads of the
+            # threadpool and the open database connections. The fork server is not
+            # available on Windows, that spawns the fresh interpreter instead.
+            # docs: https://docs.python.org/3/library/multiprocessing.html#contexts-and-start-methods
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(method),
+            )
+        return self._executor
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # The semaphore is bound to the event loop that uses it first.
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def run(self, func: Callable, *args: Any) -> Any:
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        acquired: bool = False
+        try:
+            async with self.semaphore:
+                acquired = True
+                self.waiting -= 1
+                self.running += 1
+                try:
+                    return await asyncio.get_running_loop().run_in_executor(
+                        self.executor, func, *args
+                    )
+                finally:
+                    self.running -= 1
+                    self.completed += 1
+        finally:
+            if not acquired:
+                self.waiting -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self.run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "concurrency": self.concurrency,
+            "running": self.running,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "completed": self.completed,
+        }
+
+
+password_service: PasswordService = PasswordService(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    concurrency=settings.PASSWORD_HASH_CONCURRENCY,
+)
@@ -0,0 +1,66 @@
+from typing import AsyncIterator, Iterable, Optional
+from fastapi import Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE: str = "application/x-ndjson"
+
+
+async def ndjson(batches: AsyncIterator[Iterable[BaseModel]]) -> AsyncIterator[bytes]:
+    """Serialize the batches of rows to newline-delimited JSON, one chunk per batch"""
+    async for batch in batches:
+        if chunk := "".join(f"{item.json()}\n" for item in batch):
+            yield chunk.encode()
+
+
+async def json_array(batches: AsyncIterator[Iterable[BaseModel]]) -> AsyncIterator[bytes]:
+    """Serialize the batches of rows to one JSON array that is written incrementally"""
+    separator = "["
+    async for batch in batches:
+        chunk = []
+        for item in batch:
+            chunk.append(separator)
+            chunk.append(item.json())
+            separator = ","
+        if chunk:
+            yield "".join(chunk).encode()
+    yield b"[]" if separator == "[" else b"]"
+
+
+class StreamFormat:
+    """Dependency that selects the streaming mode of the list endpoint, from the
+    `stream` query parameter or from the `Accept: application/x-ndjson` header.
+    The streaming response serializes the rows as they come out of the database,
+    instead of the whole list, so its memory and time-to-first-byte do not depend
+    on the size of the listing.
+
+    implemented:
+
+        ..> @router.get('/', response_model=Page[Schema])
+        ... async def read_all(stream: StreamFormat = Depends(StreamFormat), ...):
+        ...     if stream:
+        ...         return stream.response(service.stream())
+        ...     return ...
+
+    """
+
+    def __init__(
+            self,
+            request: Request,
+            stream: Optional[str] = Query(
+                None,
+                regex="^(ndjson|json)$",
+                description="Stream all rows as `ndjson` or as `json` array instead of the page",
+            ),
+    ) -> None:
+        if stream is None and NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+            stream = "ndjson"
+        self.format: Optional[str] = stream
+
+    def __bool__(self) -> bool:
+        return self.format is not None
+
+    def response(self, batches: AsyncIterator[Iterable[BaseModel]]) -> StreamingResponse:
+        if self.format == "ndjson":
+            return StreamingResponse(ndjson(batches), media_type=NDJSON_MEDIA_TYPE)
+        return StreamingResponse(json_array(batches), media_type="application/json")
@@ -0,0 +1,377 @@
+import hashlib
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Hashable, Mapping, Optional, Union
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+from jinja2 import pass_context, select_autoescape
+from markupsafe import Markup
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
+from fastapi.templating import Jinja2Templates
+from starlette.background import BackgroundTask
+from starlette.datastructures import MutableHeaders
+from .config import settings
+from .instrumentation import timing
+from .utils.caches import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+class FragmentCache:
+    """Bounded LRU cache of rendered template fragments. An entry is keyed on the
+    object that it renders, like `('ticket', ticket.id)`, and it is valid while
+    the version of this object, like `ticket.update_at`, does not change.
+
+    usages:
+
+        ..> fragment_cache.render(template, context, key=('ticket', 1), version=...)
+        ... fragment_cache.invalidate(('ticket', 1))
+
+    """
+
+    def __init__(self, maxsize: int = 2048) -> None:
+        self.cache: LRUCache = LRUCache(maxsize=maxsize)
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def render(self, template: Template, context: dict, *, key: Hashable, version: Any) -> Markup:
+        # The `url_for` function returns the absolute URL, so the rendered fragment
+        # depends on the base URL of the request.
+        variant = (template.name, str(context["request"].base_url))
+        entries: dict = self.cache.get(key) or {}
+        if (cached := entries.get(variant)) and cached[0] == version:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        html = Markup(template.render(context))
+        self.cache.set(key, {**entries, variant: (version, html)})
+        return html
+
+    def invalidate(self, key: Hashable) -> None:
+        self.cache.pop(key)
+
+    def stats(self) -> dict:
+        requests = self.hits + self.misses
+        return {
+            **self.cache.stats(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / requests, 4) if requests else 0.0,
+        }
+
+
+fragment_cache: FragmentCache = FragmentCache(maxsize=settings.TEMPLATES_FRAGMENT_CACHE_SIZE)
+
+
+class TemplateEngine:
+    """Process-wide Jinja2 template engine. The environment, and the compiled
+    templates that it keeps in its cache, live as long as the worker process
+    instead of being re-created on every request.
+
+    usages:
+
+        ..> engine = TemplateEngine(directory='backend/templates')
+        ... engine.precompile()
+        ... engine.templates.TemplateResponse('tickets/index.html', context)
+
+    """
+
+    def __init__(
+            self,
+            directory: Union[str, Path],
+            *,
+            auto_reload: bool = True,
+            bytecode_cache_dir: Optional[Union[str, Path]] = None,
+    ) -> None:
+        self.directory: Path = Path(directory)
+        self.auto_reload: bool = auto_reload
+        self._version: Optional[str] = None
+        options: dict = {
+            # Check the modified time of template files before return it from the
+            # environment cache. This should be disabled on production.
+            "auto_reload": auto_reload,
+
+            # Strip left of spaces in any blocks of HTML template.
+            "lstrip_blocks": True,
+        }
+        async_options: dict = options.copy()
+        if bytecode_cache_dir:
+            # Persist the compiled bytecode of templates on disk, so a cold worker
+            # can load them without parse and compile the template sources again.
+            # docs: https://jinja.palletsprojects.com/en/3.1.x/api/#bytecode-cache
+            Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+            options["bytecode_cache"] = FileSystemBytecodeCache(str(bytecode_cache_dir))
+
+            # The async environment compiles templates to different code, so it
+            # must not load the bytecode of the sync environment.
+            async_options["bytecode_cache"] = FileSystemBytecodeCache(
+                str(bytecode_cache_dir), pattern="__jinja2_async_%s.cache"
+            )
+        self.templates: Jinja2Templates = Jinja2Templates(
+            directory=str(self.directory),
+            autoescape=True,
+            **options,
+        )
+
+        # The async environment can loop over async iterables, like the result of
+        # `session.stream`, inside the template for the streaming render mode.
+        # docs: https://jinja.palletsprojects.com/en/3.1.x/api/#async-support
+        self.async_templates: Jinja2Templates = Jinja2Templates(
+            directory=str(self.directory),
+            autoescape=True,
+            enable_async=True,
+            **async_options,
+        )
+
+        # Render the partial template with the fragment cache inside other template.
+        # usages: `{{ fragment('tickets/partials/ticket.html', key=('ticket', ticket.id),
+        #          version=ticket.update_at, ticket=ticket) }}`
+        @pass_context
+        def fragment(context, name: str, *, key: Hashable, version: Any, **variables: Any) -> Markup:
+            return self.render_fragment(
+                name, {"request": context["request"], **variables}, key=key, version=version
+            )
+
+        for env in (self.templates.env, self.async_templates.env):
+            env.globals["fragment"] = fragment
+            env.globals["url_for"] = _asset_url_for(env.globals["url_for"])
+
+    @property
+    def env(self) -> Environment:
+        return self.templates.env
+
+    @property
+    def version(self) -> str:
+        """Return the digest of the names and modified times of all templates. It
+        is a part of the cache validators of rendered pages, so a deployment with
+        changed templates does not answer `304 Not Modified` for the old pages.
+        """
+        if self._version is None or self.auto_reload:
+            digest = hashlib.sha1()
+            for name in sorted(self.env.list_templates(extensions=("html", ))):
+                digest.update(f"{name}:{(self.directory / name).stat().st_mtime_ns}".encode())
+            self._version = digest.hexdigest()[:12]
+        return self._version
+
+    def precompile(self) -> int:
+        """Load every template in the template directory to the environment cache
+        and return the number of compiled templates.
+        """
+        names = self.env.list_templates(extensions=("html", ))
+        for name in names:
+            self.env.get_template(name)
+            self.async_templates.env.get_template(name)
+        logger.info(f"precompiled {len(names)} templates from {self.directory}")
+        return len(names)
+
+    def render_fragment(self, name: str, context: dict, *, key: Hashable, version: Any) -> Markup:
+        """Return the rendered partial template from the fragment cache"""
+        return fragment_cache.render(
+            self.templates.get_template(name), context, key=key, version=version
+        )
+
+    def render(
+            self,
+            request: Request,
+            name: str,
+            context: dict,
+            *,
+            block: Optional[str] = None,
+            stream: bool = False,
+            status_code: int = 200,
+            headers: Optional[Mapping[str, str]] = None,
+            background: Optional[BackgroundTask] = None,
+    ) -> Response:
+        """Return the full page for the browser navigation, or only the named block
+        of the template for the HTMX request. The block that has the same name as
+        the `HX-Target` element id wins over the `block` argument.
+
+        usages:
+
+            ..> engine.render(request, 'users/index.html', context, block='content')
+
+        """
+        templates = self.async_templates if stream else self.templates
+        template = templates.get_template(name)
+        headers = MutableHeaders(headers=dict(headers or {}))
+        headers.add_vary_header("HX-Request, HX-Target")
+        if not (block := select_block(request, template, block)):
+            if stream:
+                return self.stream(
+                    name, context, status_code=status_code, headers=headers, background=background
+                )
+            with timing("tpl"):
+                return templates.TemplateResponse(
+                    name, context, status_code=status_code, headers=headers, background=background
+                )
+
+        render_block = template.blocks[block]
+        if stream:
+            return StreamingResponse(
+                _buffered(render_block(template.new_context(context)), 4096),
+                status_code=status_code,
+                headers=headers,
+                media_type="text/html",
+                background=background,
+            )
+        with timing("tpl"):
+            html = "".join(render_block(template.new_context(context)))
+        return HTMLResponse(
+            html,
+            status_code=status_code,
+            headers=headers,
+            background=background,
+        )
+
+    def stream(
+            self,
+            name: str,
+            context: dict,
+            status_code: int = 200,
+            headers: Optional[Mapping[str, str]] = None,
+            background: Optional[BackgroundTask] = None,
+            buffer_size: int = 4096,
+    ) -> StreamingResponse:
+        """Return the streaming response that render the template while the async
+        iterables in the context are consumed.
+
+        usages:
+
+            ..> engine.stream('tickets/index.html', {"request": request, "tickets": aiter})
+
+        """
+        if "request" not in context:
+            raise ValueError('context must include a "request" key')
+        template = self.async_templates.get_template(name)
+        return StreamingResponse(
+            _buffered(template.generate_async(context), buffer_size),
+            status_code=status_code,
+            headers=headers,
+            media_type="text/html",
+            background=background,
+        )
+
+
+class EmailTemplates:
+    """Registry of the email templates. It compiles every template of the email
+    directory once, and renders the messages from the compiled templates instead
+    of reading and parsing the template file for every message.
+
+    usages:
+
+        ..> email_templates = EmailTemplates('backend/templates/emails')
+        ... email_templates.precompile()
+        ... email_templates.render('new_account.html', username='foo', ...)
+
+    """
+
+    def __init__(
+            self,
+            directory: Union[str, Path],
+            *,
+            auto_reload: bool = True,
+            bytecode_cache_dir: Optional[Union[str, Path]] = None,
+    ) -> None:
+        self.directory: Path = Path(directory)
+        options: dict = {}
+        if bytecode_cache_dir:
+            Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+            options["bytecode_cache"] = FileSystemBytecodeCache(
+                str(bytecode_cache_dir), pattern="__jinja2_email_%s.cache"
+            )
+        self.env: Environment = Environment(
+            loader=FileSystemLoader(str(self.directory)),
+            autoescape=select_autoescape(),
+            auto_reload=auto_reload,
+            **options,
+        )
+
+    def precompile(self) -> int:
+        names = self.env.list_templates(extensions=("html", ))
+        for name in names:
+            self.env.get_template(name)
+        logger.info(f"precompiled {len(names)} email templates from {self.directory}")
+        return len(names)
+
+    def render(self, name: str, **context: Any) -> str:
+        return self.env.get_template(name).render(context)
+
+
+def _asset_url_for(url_for: Callable) -> Callable:
+    """Wrap the `url_for` function of templates to return the fingerprinted URL of
+    the static file from the asset manifest.
+    """
+    from .assets import manifest
+
+    @pass_context
+    def asset_url_for(context, name: str, **path_params: Any) -> str:
+        if name == "static" and "path" in path_params:
+            path_params["path"] = manifest.resolve(path_params["path"])
+        return url_for(context, name, **path_params)
+
+    return asset_url_for
+
+
+def is_htmx(request: Request) -> bool:
+    """Return True if the request was made by HTMX to swap a part of the page. The
+    boosted and history restore requests are handled as the page navigation,
+    because HTMX swaps the whole body with their responses.
+    docs: https://htmx.org/reference/#request_headers
+    """
+    headers = request.headers
+    return (
+        headers.get("HX-Request") == "true"
+        and headers.get("HX-Boosted") != "true"
+        and headers.get("HX-History-Restore-Request") != "true"
+    )
+
+
+def select_block(request: Request, template: Template, block: Optional[str]) -> Optional[str]:
+    """Return the name of the template block that should be rendered for this
+    request, or None if the full template should be rendered.
+    """
+    if not block or not is_htmx(request):
+        return None
+    if (target := request.headers.get("HX-Target")) and target in template.blocks:
+        return target
+    return block
+
+
+async def _buffered(chunks: AsyncIterator[str], size: int) -> AsyncIterator[str]:
+    """Join the small chunks of the template generator to the chunk that has the
+    `size` length. The head of the HTML document is sent at once, so the browser
+    can start fetching the stylesheets and scripts.
+    """
+    buffer: list = []
+    length: int = 0
+    head: bool = True
+    async for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size or (head and "</head>" in chunk):
+            head = False
+            yield "".join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+@lru_cache()
+def get_template_engine() -> TemplateEngine:
+    """Return the template engine of this process"""
+    return TemplateEngine(
+        settings.TEMPLATES_DIR,
+        auto_reload=settings.TEMPLATES_AUTO_RELOAD,
+        bytecode_cache_dir=settings.TEMPLATES_BYTECODE_CACHE_DIR,
+    )
+
+
+@lru_cache()
+def get_email_templates() -> EmailTemplates:
+    """Return the email template registry of this process"""
+    return EmailTemplates(
+        settings.EMAIL_TEMPLATES_DIR,
+        auto_reload=settings.EMAIL_TEMPLATES_AUTO_RELOAD,
+        bytecode_cache_dir=settings.TEMPLATES_BYTECODE_CACHE_DIR,
+    )
@@ -1,13 +1,17 @@
-from typing import AsyncGenerator, Generator
+from pathlib import Path
+from typing import AsyncGenerator, Callable, Generator
 import pytest
+from fastapi import FastAPI
 from httpx import AsyncClient
 from sqlalchemy import create_engine, event
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from backend.database import get_session
+from backend.database import get_session, get_async_session, get_async_read_session
 from backend.app import create_app
 from backend.database import Base
 from backend.config import settings
+from backend.instrumentation import instrument
+from backend.migrations import migrate
 
 
 @pytest.fixture
@@ -44,7 +48,7 @@ def setup_db() -> Generator:
     conn.close()
 
 
-@pytest.fixture(scope="session", autouse=True)
+@pytest.fixture(scope="session")
 def setup_test_db(setup_db):
     engine = create_engine(f"{settings.SQLALCHEMY_DATABASE_ASYNC_URL.replace('+asyncpg', '')}/test")
 
@@ -56,7 +60,7 @@ def setup_test_db(setup_db):
 
 
 @pytest.fixture
-async def session():
+async def session(setup_test_db):
     # https://github.com/sqlalchemy/sqlalchemy/issues/5811#issuecomment-756269881
     async_engine = create_async_engine(f"{settings.SQLALCHEMY_DATABASE_ASYNC_URL}/test")
     async with async_engine.connect() as conn:
@@ -90,3 +94,41 @@ async def session():
         yield async_session
         await async_session.close()
         await conn.rollback()
+
+
+@pytest.fixture
+def database(tmp_path) -> Path:
+    """Return the path of the SQLite database file that is migrated to the head"""
+    path = tmp_path / "db.sqlite3"
+    migrate(create_engine(f"sqlite:///{path}"), tmp_path / "schema.lock")
+    return path
+
+
+@pytest.fixture
+def async_session(database) -> async_sessionmaker:
+    """Return the async session factory of the test database, that is instrumented
+    like the engines of the application.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{database}")
+    instrument(engine.sync_engine)
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+@pytest.fixture
+def override_sessions(async_session) -> Callable[[FastAPI], FastAPI]:
+    """Return the function that routes the services of the app to the test database.
+
+    usages:
+
+        ..> client = TestClient(override_sessions(create_app()))
+
+    """
+    async def get_test_session() -> AsyncGenerator:
+        yield async_session
+
+    def override(app: FastAPI) -> FastAPI:
+        app.dependency_overrides[get_async_session] = get_test_session
+        app.dependency_overrides[get_async_read_session] = get_test_session
+        return app
+
+    return override
@@ -0,0 +1,24 @@
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from ..config import settings
+from ..dependencies import get_token_header
+from ..internal import admin
+
+app = FastAPI()
+app.include_router(admin, prefix="/api/v1", dependencies=[Depends(get_token_header)])
+client = TestClient(app)
+
+
+def test_stats_takes_the_internal_token(monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_TOKEN", "secret")
+    assert client.get("/api/v1/stats").status_code == 422
+    assert client.get("/api/v1/stats", headers={"X-Token": "wrong"}).status_code == 403
+
+    response = client.get("/api/v1/stats", headers={"X-Token": "secret"})
+    assert response.status_code == 200
+    assert {"pools", "mail", "passwords"} <= set(response.json())
+
+
+def test_stats_is_disabled_without_the_internal_token(monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_TOKEN", None)
+    assert client.get("/api/v1/stats", headers={"X-Token": ""}).status_code == 403
@@ -0,0 +1,83 @@
+import base64
+import gzip
+import hashlib
+from pathlib import Path
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from ..assets import (
+    IMMUTABLE_CACHE_CONTROL,
+    VENDORED_ASSETS,
+    AssetManifest,
+    ImmutableStaticFiles,
+)
+from ..config import settings
+
+STYLES: bytes = b"body { color: #333; }\n" * 20
+ICON: bytes = b"\x89PNG\r\n"
+
+
+def make_manifest(tmp_path: Path) -> AssetManifest:
+    source = tmp_path / "static"
+    (source / "css").mkdir(parents=True)
+    (source / "css" / "base.css").write_bytes(STYLES)
+    (source / "favicon.png").write_bytes(ICON)
+    (source / ".hidden").write_bytes(b"")
+    return AssetManifest(source, tmp_path / "build")
+
+
+def test_vendored_assets_match_their_integrity():
+    for path, asset in VENDORED_ASSETS.items():
+        content = (Path(settings.STATIC_DIR) / path).read_bytes()
+        algorithm, expected = asset["integrity"].split("-", 1)
+        assert base64.b64encode(hashlib.new(algorithm, content).digest()).decode() == expected
+
+
+def test_manifest_build(tmp_path):
+    manifest = make_manifest(tmp_path)
+    paths = manifest.build()
+
+    digest = hashlib.sha256(STYLES).hexdigest()[:12]
+    assert paths == {
+        "css/base.css": f"css/base.{digest}.css",
+        "favicon.png": f"favicon.{hashlib.sha256(ICON).hexdigest()[:12]}.png",
+    }
+    assert manifest.resolve("/css/base.css") == f"css/base.{digest}.css"
+    assert manifest.resolve("css/unknown.css") == "css/unknown.css"
+    assert manifest.is_immutable(f"css/base.{digest}.css")
+    assert not manifest.is_immutable("css/base.css")
+
+    # Both names are written with their gzip sibling, except the binary file.
+    build = tmp_path / "build"
+    for name in ("css/base.css", f"css/base.{digest}.css"):
+        assert (build / name).read_bytes() == STYLES
+        assert gzip.decompress((build / f"{name}.gz").read_bytes()) == STYLES
+    assert not (build / "favicon.png.gz").exists()
+    assert not (build / ".hidden").exists()
+
+
+def test_immutable_static_files(tmp_path):
+    manifest = make_manifest(tmp_path)
+    manifest.build()
+    app = FastAPI()
+    app.mount("/static", ImmutableStaticFiles(manifest=manifest), name="static")
+    client = TestClient(app)
+
+    hashed = manifest.resolve("css/base.css")
+    response = client.get(f"/static/{hashed}", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == STYLES
+
+    response = client.get(
+        f"/static/{hashed}",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]},
+    )
+    assert response.status_code == 304
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+    response = client.get("/static/css/base.css", headers={"Accept-Encoding": "identity"})
+    assert response.headers["cache-control"] == "no-cache"
+    assert "content-encoding" not in response.headers
+    assert response.content == STYLES
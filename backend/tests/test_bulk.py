@@ -0,0 +1,70 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from ..config import settings
+from ..routers.tickets.routes import tickets
+from ..routers.users.routes import users
+from ..securities import password_service
+
+
+@pytest.fixture
+def client(database, override_sessions) -> TestClient:
+    with create_engine(f"sqlite:///{database}").begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (email, username, hashed_password, is_active, is_superuser) "
+            "VALUES ('taken@example.com', 'taken', 'hashed', 1, 0)"
+        ))
+    app = FastAPI()
+    app.include_router(users)
+    app.include_router(tickets)
+    return TestClient(override_sessions(app))
+
+
+def statuses(response) -> list:
+    return [(result["index"], result["status"]) for result in response.json()["results"]]
+
+
+def test_create_users_bulk(client):
+    try:
+        response = client.post("/users/bulk", json=[
+            {"email": "first@example.com", "username": "first", "password": "password"},
+            {"email": "not-an-email", "username": "invalid", "password": "password"},
+            {"email": "other@example.com", "username": "taken", "password": "password"},
+            {"email": "second@example.com", "username": "second", "password": "password"},
+            {"email": "first@example.com", "username": "repeated", "password": "password"},
+            {"email": "third@example.com", "username": "second", "password": "password"},
+        ])
+    finally:
+        password_service.shutdown()
+    assert response.status_code == 200
+    assert response.json()["created"] == 2
+    assert statuses(response) == [(0, 201), (1, 422), (2, 409), (3, 201), (4, 409), (5, 409)]
+
+    results = response.json()["results"]
+    assert [results[i]["item"]["username"] for i in (0, 3)] == ["first", "second"]
+    assert results[1]["item"] is None
+    assert results[1]["errors"][0]["loc"] == ["email"]
+    assert "hashed_password" not in results[0]["item"]
+
+
+def test_create_tickets_bulk(client):
+    response = client.post("/tickets/bulk", json=[
+        {"text": "first"},
+        {"description": "no text"},
+        {"text": "second", "description": "description"},
+    ])
+    assert response.status_code == 200
+    assert response.json()["created"] == 2
+    assert statuses(response) == [(0, 201), (1, 422), (2, 201)]
+    items = [result["item"] for result in response.json()["results"]]
+    assert [items[0]["text"], items[2]["description"]] == ["first", "description"]
+    assert items[0]["id"] < items[2]["id"]
+
+
+def test_bulk_over_max_items(client, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_MAX_ITEMS", 2)
+    response = client.post("/tickets/bulk", json=[{"text": "ticket"}] * 3)
+    assert response.status_code == 413
+    response = client.post("/users/bulk", json=[{}] * 3)
+    assert response.status_code == 413
@@ -0,0 +1,77 @@
+import time
+from types import SimpleNamespace
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from jinja2 import Environment, DictLoader
+from ..utils.caches import LRUCache, TTLCache
+from ..templating import FragmentCache, TemplateEngine
+
+
+def test_lru_cache_eviction():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_expiration():
+    cache = TTLCache(maxsize=8, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2, expire_at=time.time() - 1)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert "b" not in cache
+    assert cache.stats()["expirations"] == 1
+    assert cache.pop("a") == 1
+
+
+def test_fragment_cache_version():
+    env = Environment(loader=DictLoader({"ticket.html": "<li>{{ ticket.text }}</li>"}))
+    template = env.get_template("ticket.html")
+    request = SimpleNamespace(base_url="http://test/")
+    cache = FragmentCache(maxsize=8)
+
+    context = {"request": request, "ticket": {"text": "foo"}}
+    assert cache.render(template, context, key=("ticket", 1), version=1) == "<li>foo</li>"
+
+    context = {"request": request, "ticket": {"text": "bar"}}
+    assert cache.render(template, context, key=("ticket", 1), version=1) == "<li>foo</li>"
+    assert cache.render(template, context, key=("ticket", 1), version=2) == "<li>bar</li>"
+
+    cache.invalidate(("ticket", 1))
+    context = {"request": request, "ticket": {"text": "baz"}}
+    assert cache.render(template, context, key=("ticket", 1), version=2) == "<li>baz</li>"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 3
+
+
+def test_render_appends_to_the_vary_header(tmp_path):
+    (tmp_path / "page.html").write_text("<main>{% block content %}content{% endblock %}</main>")
+    engine = TemplateEngine(directory=tmp_path)
+    app = FastAPI()
+
+    @app.get("/")
+    def page(request: Request):
+        return engine.render(
+            request, "page.html", {"request": request}, block="content", headers={"Vary": "Cookie"}
+        )
+
+    response = TestClient(app).get("/", headers={"HX-Request": "true"})
+    assert response.text == "content"
+    assert response.headers["vary"] == "Cookie, HX-Request, HX-Target"
+
+
+def test_ttl_cache_pop_if():
+    cache = TTLCache(maxsize=8, ttl=60)
+    cache.set("old", SimpleNamespace(id=1))
+    cache.set("other", SimpleNamespace(id=2))
+    cache.set("missing", None)
+    assert cache.pop_if(lambda _, user: user is not None and user.id == 1) == 1
+    assert "old" not in cache
+    assert "other" in cache and "missing" in cache
@@ -0,0 +1,61 @@
+import asyncio
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from starlette.requests import Request
+from ..conditional import ConditionalRequest, Validator
+from ..routers.tickets.crud import ReadTicket
+
+
+def make_request(headers: dict) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        }
+    )
+
+
+def test_if_none_match():
+    validator = Validator.build("key", 1, datetime(2023, 1, 1))
+    assert ConditionalRequest(make_request({})).evaluate(validator) is None
+
+    response = ConditionalRequest(
+        make_request({"If-None-Match": validator.etag})
+    ).evaluate(validator)
+    assert response.status_code == 304
+    assert response.headers["etag"] == validator.etag
+
+    assert ConditionalRequest(
+        make_request({"If-None-Match": 'W/"other"'})
+    ).evaluate(validator) is None
+
+
+def test_if_modified_since():
+    validator = Validator.build("key", last_modified=datetime(2023, 1, 1, 12, 0, 0))
+    last_modified = validator.headers["Last-Modified"]
+    response = ConditionalRequest(
+        make_request({"If-Modified-Since": last_modified})
+    ).evaluate(validator)
+    assert response.status_code == 304
+
+    newer = Validator.build("key", last_modified=datetime(2023, 1, 2))
+    assert ConditionalRequest(
+        make_request({"If-Modified-Since": last_modified})
+    ).evaluate(newer) is None
+
+
+def test_version_of_row_without_update_datetime(database, async_session):
+    with create_engine(f"sqlite:///{database}").begin() as conn:
+        conn.execute(text("INSERT INTO tickets (text, session_key, update_at) VALUES ('legacy', 'a', NULL)"))
+    service = ReadTicket(async_session)
+
+    validator = asyncio.run(service.version(1))
+    assert validator.etag == Validator.build(1, None).etag
+    assert validator.last_modified is None
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(service.version(2))
+    assert exc_info.value.status_code == 404
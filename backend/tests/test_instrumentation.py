@@ -0,0 +1,79 @@
+import logging
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from ..app import create_app
+from ..config import settings
+from ..instrumentation import RequestMetrics, instrument, request_metrics, timing
+from ..routers.tickets.crud import ReadTicket
+
+
+def test_request_metrics_count_statements_and_repeats(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SQL_N_PLUS_ONE_THRESHOLD", 3)
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite3'}")
+    instrument(engine)
+
+    # The statements out of the request are not counted.
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    metrics = RequestMetrics()
+    token = request_metrics.set(metrics)
+    try:
+        with engine.connect() as conn, timing("tpl"):
+            conn.execute(text("SELECT 1"))
+            for i in range(3):
+                conn.execute(text("SELECT :id"), {"id": i})
+    finally:
+        request_metrics.reset(token)
+
+    assert metrics.statements == 4
+    assert metrics.repeated(3) == [("SELECT ?", 3)]
+    header = metrics.server_timing(12.5)
+    assert header.startswith('sql;dur=') and 'desc="4 statements"' in header
+    assert ", tpl;dur=" in header and header.endswith("total;dur=12.50")
+
+
+def test_request_metrics_count_failed_statement(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite3'}")
+    instrument(engine)
+
+    metrics = RequestMetrics()
+    token = request_metrics.set(metrics)
+    try:
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing"))
+            assert "query_start_time" not in conn.info
+            conn.execute(text("SELECT 1"))
+    finally:
+        request_metrics.reset(token)
+    assert metrics.statements == 2
+
+
+def test_server_timing_and_n_plus_one_warning(async_session, override_sessions, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", True)
+    monkeypatch.setattr(settings, "SQL_N_PLUS_ONE_THRESHOLD", 3)
+    app = override_sessions(create_app())
+
+    # The route that reads the tickets one by one in the loop.
+    @app.get("/n-plus-one")
+    async def n_plus_one():
+        return [(await ReadTicket(async_session).execute(ticket_id)).text for ticket_id in range(1, 4)]
+
+    client = TestClient(app)
+    for i in range(3):
+        client.post("/api/v1/tickets/", params={"text": f"ticket {i}"})
+
+    with caplog.at_level(logging.INFO, logger="backend.app"):
+        response = client.get("/ticket/")
+        assert response.status_code == 200
+        assert response.headers["Server-Timing"].startswith("sql;dur=")
+        assert "total;dur=" in response.headers["Server-Timing"]
+        assert not [r for r in caplog.records if "N+1" in r.getMessage()]
+
+        assert client.get("/n-plus-one").json() == ["ticket 0", "ticket 1", "ticket 2"]
+    warnings = [r.getMessage() for r in caplog.records if "N+1" in r.getMessage()]
+    assert len(warnings) == 1
+    assert "path=/n-plus-one count=3" in warnings[0]
@@ -0,0 +1,95 @@
+import asyncio
+from ..utils.mailer import MailQueue, build_message
+
+
+class StandInSMTPServer:
+    """Minimal SMTP server that keeps the received messages. The first
+    `fail_data` DATA commands are refused with the transient `451` reply.
+    """
+
+    def __init__(self, fail_data: int = 0) -> None:
+        self.fail_data: int = fail_data
+        self.messages: list = []
+        self.connections: int = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        writer.write(b"220 localhost ESMTP\r\n")
+        while line := await reader.readline():
+            command = line.decode().strip().upper()
+            if command.startswith("DATA"):
+                if self.fail_data:
+                    self.fail_data -= 1
+                    writer.write(b"451 Try again later\r\n")
+                    continue
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                await writer.drain()
+                data = await reader.readuntil(b"\r\n.\r\n")
+                self.messages.append(data)
+                writer.write(b"250 OK\r\n")
+            elif command.startswith("QUIT"):
+                writer.write(b"221 Bye\r\n")
+                await writer.drain()
+                break
+            else:
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+        writer.close()
+
+
+async def send(server: StandInSMTPServer, count: int) -> MailQueue:
+    smtp = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    port = smtp.sockets[0].getsockname()[1]
+    queue = MailQueue("127.0.0.1", port, backoff=0.01)
+    await queue.start()
+    for index in range(count):
+        queue.submit(build_message(f"user{index}@example.com", "Subject", "<p>Hello</p>"))
+    await asyncio.wait_for(queue.join(), 10)
+    await queue.stop()
+    smtp.close()
+    return queue
+
+
+def test_mail_queue_reuses_connection():
+    server = StandInSMTPServer()
+    queue = asyncio.run(send(server, 5))
+    assert len(server.messages) == 5
+    assert server.connections == 1
+    assert queue.stats()["sent"] == 5
+
+
+def test_mail_queue_retries_transient_failure():
+    server = StandInSMTPServer(fail_data=2)
+    queue = asyncio.run(send(server, 1))
+    assert len(server.messages) == 1
+    assert queue.stats()["retried"] == 2
+    assert queue.stats()["failed"] == 0
+
+
+def test_mail_queue_retry_does_not_block_the_queue():
+    async def main():
+        server = StandInSMTPServer(fail_data=1)
+        smtp = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        queue = MailQueue("127.0.0.1", smtp.sockets[0].getsockname()[1], backoff=0.5)
+        await queue.start()
+        await queue.start()
+        queue.submit(build_message("first@example.com", "Subject", "<p>Hello</p>"))
+        while not queue.retried:
+            await asyncio.sleep(0.01)
+
+        # The second message is sent while the first one waits for its backoff.
+        queue.submit(build_message("second@example.com", "Subject", "<p>Hello</p>"))
+        await asyncio.wait_for(queue.join(), 10)
+        await queue.stop()
+        smtp.close()
+        return server
+
+    server = asyncio.run(main())
+    assert [b"second@example.com" in data for data in server.messages] == [True, False]
+    assert server.connections == 1
+
+
+def test_mail_queue_drops_message_before_start():
+    queue = MailQueue("127.0.0.1")
+    queue.submit(build_message("user@example.com", "Subject", "<p>Hello</p>"))
+    assert queue.stats()["dropped"] == 1
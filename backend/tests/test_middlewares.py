@@ -0,0 +1,56 @@
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse, HTMLResponse
+from fastapi.testclient import TestClient
+from ..middlewares import CompressionMiddleware
+
+app = FastAPI()
+app.add_middleware(CompressionMiddleware, minimum_size=100, content_types=["text/html"])
+
+
+@app.get("/small")
+def small():
+    return HTMLResponse("<p>small</p>")
+
+
+@app.get("/large")
+def large():
+    return HTMLResponse("<p>large</p>" * 100)
+
+
+@app.get("/text")
+def text():
+    return PlainTextResponse("text" * 100)
+
+
+@app.get("/stream")
+def stream():
+    async def chunks():
+        for _ in range(10):
+            yield "<li>item</li>" * 10
+
+    return StreamingResponse(chunks(), media_type="text/html")
+
+
+client = TestClient(app)
+
+
+def test_compression_threshold():
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < 1200
+    assert response.text == "<p>large</p>" * 100
+
+
+def test_compression_content_type():
+    response = client.get("/text", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+def test_compression_streaming():
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == "<li>item</li>" * 100
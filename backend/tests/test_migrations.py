@@ -0,0 +1,114 @@
+import asyncio
+import sqlite3
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from ..migrations import head, migrate
+from ..routers.users.crud import users_repository
+from ..routers.users.models import User
+
+
+def test_migrate_applies_pending_revisions_once(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite3'}")
+    lock_path = tmp_path / "schema.lock"
+
+    assert migrate(engine, lock_path) == head()
+    assert {"tickets", "users", "schema_version"} <= set(inspect(engine).get_table_names())
+
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO tickets (text, description, session_key) VALUES ('a', 'b', 'c')"))
+    assert migrate(engine, lock_path) == head()
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM tickets")).scalar() == 1
+        assert conn.execute(text("SELECT COUNT(*) FROM schema_version")).scalar() == head()
+
+
+# The schema of the database that is created by `create_all` before the versioned
+# schema, without the datetimes of users, and with the nullable create datetime
+# of tickets.
+BASELINE_SCHEMA = """
+CREATE TABLE tickets (
+    id INTEGER NOT NULL, text VARCHAR, description VARCHAR, session_key VARCHAR,
+    create_at DATETIME, update_at DATETIME, CONSTRAINT tickets_pkey PRIMARY KEY (id)
+);
+CREATE TABLE users (
+    id INTEGER NOT NULL, username VARCHAR, email VARCHAR, hashed_password VARCHAR NOT NULL,
+    is_active BOOLEAN, is_superuser BOOLEAN, CONSTRAINT users_pkey PRIMARY KEY (id)
+);
+CREATE UNIQUE INDEX main_users_username_idx ON users (username);
+CREATE TABLE user_tickets (
+    id INTEGER NOT NULL, text VARCHAR, description VARCHAR, create_at DATETIME, owner_id INTEGER,
+    CONSTRAINT user_tickets_pkey PRIMARY KEY (id),
+    CONSTRAINT user_tickets_owner_id_fkey FOREIGN KEY(owner_id) REFERENCES users (id)
+);
+INSERT INTO users (username, email, hashed_password, is_active, is_superuser)
+VALUES ('legacy', 'legacy@example.com', 'hash', 1, 0);
+INSERT INTO tickets (text, session_key, create_at, update_at)
+VALUES ('dated', 'a', '2023-01-01 00:00:00.000000', NULL),
+       ('updated', 'a', NULL, '2023-02-01 00:00:00.000000'),
+       ('undated', 'a', NULL, NULL);
+"""
+
+
+def test_migrate_upgrades_the_baseline_schema(tmp_path):
+    path = tmp_path / "db.sqlite3"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(BASELINE_SCHEMA)
+    assert migrate(create_engine(f"sqlite:///{path}"), tmp_path / "schema.lock") == head()
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    async def read():
+        async with AsyncSession(engine) as session:
+            user = await users_repository.get(session, 1)
+            _, version = await User.read_version_by_id(session, 1)
+        await engine.dispose()
+        return user, version
+
+    user, version = asyncio.run(read())
+    assert user.username == "legacy"
+    assert user.create_at is not None and user.update_at == version
+
+
+def test_migrate_makes_tickets_create_at_not_null(tmp_path):
+    path = tmp_path / "db.sqlite3"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(BASELINE_SCHEMA)
+    engine = create_engine(f"sqlite:///{path}")
+    migrate(engine, tmp_path / "schema.lock")
+
+    with engine.begin() as conn:
+        rows = conn.execute(text("SELECT text, create_at FROM tickets ORDER BY id")).all()
+        assert rows[:2] == [("dated", "2023-01-01 00:00:00.000000"), ("updated", "2023-02-01 00:00:00.000000")]
+        assert rows[2].create_at is not None
+        with pytest.raises(IntegrityError):
+            conn.execute(text("UPDATE tickets SET create_at = NULL WHERE id = 1"))
+
+    # The default of the rows that are inserted without the ORM has the storage
+    # format of the ORM, and the search index still follows the rebuilt table.
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO tickets (text, session_key) VALUES ('printer', 'a')"))
+        create_at = conn.execute(text("SELECT create_at FROM tickets WHERE id = 4")).scalar()
+        assert datetime.strptime(create_at, "%Y-%m-%d %H:%M:%S.%f")
+        assert conn.execute(text(
+            "SELECT rowid FROM tickets_fts WHERE tickets_fts MATCH 'print*'"
+        )).scalars().all() == [4]
+
+
+def test_failed_revision_is_rolled_back(tmp_path, monkeypatch):
+    from .. import migrations
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite3'}")
+    lock_path = tmp_path / "schema.lock"
+
+    # The revision 3 fails after it created the search table of tickets.
+    monkeypatch.setattr(migrations, "FTS_TRIGGERS", "CREATE TRIGGER broken END;")
+    with pytest.raises(Exception):
+        migrate(engine, lock_path)
+    assert "tickets_fts" not in inspect(engine).get_table_names()
+    assert "tickets" not in inspect(engine).get_table_names()
+
+    monkeypatch.undo()
+    assert migrate(engine, lock_path) == head()
@@ -0,0 +1,41 @@
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from ..app import create_app
+from ..pagination import decode_cursor, encode_cursor
+from ..routers.tickets.models import Ticket
+
+
+def test_cursor_round_trip():
+    create_at = datetime(2023, 3, 1, 12, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(create_at, 42), datetime, int) == (create_at, 42)
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor("not-a-cursor", datetime, int)
+    assert exc_info.value.status_code == 400
+
+
+def test_tickets_keyset_pages(database, override_sessions):
+    with create_engine(f"sqlite:///{database}").begin() as conn:
+        # The tickets that share the create datetime are ordered by id.
+        conn.execute(insert(Ticket), [
+            {"text": f"text {i}", "session_key": "test", "create_at": datetime(2023, 3, 1)}
+            for i in range(5)
+        ])
+    client = TestClient(override_sessions(create_app()))
+
+    ids, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/tickets/", params=params)
+        assert response.status_code == 200
+        ids += [ticket["id"] for ticket in response.json()["items"]]
+        if not (cursor := response.json()["next_cursor"]):
+            break
+    assert ids == [1, 2, 3, 4, 5]
+
+    # The page is revalidated against the version of the tickets.
+    etag = client.get("/api/v1/tickets/", params={"limit": 2}).headers["etag"]
+    response = client.get("/api/v1/tickets/", params={"limit": 2}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
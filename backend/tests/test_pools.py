@@ -0,0 +1,27 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError
+from ..pools import InstrumentedQueuePool, pool_stats, prewarm
+
+
+def test_instrumented_pool_counts_checkouts_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'db.sqlite3'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    prewarm(engine, 2)
+    assert pool_stats(engine)["checked_in"] == 2
+
+    with engine.connect(), engine.connect():
+        assert pool_stats(engine)["checked_out"] == 2
+        with pytest.raises(TimeoutError):
+            engine.connect()
+
+    # The metrics are kept when the engine recreates its pool.
+    engine.dispose()
+    stats = pool_stats(engine)
+    assert (stats["checkouts"], stats["timeouts"]) == (4, 1)
+    assert sum(stats["wait_histogram"].values()) == 4
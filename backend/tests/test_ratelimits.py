@@ -0,0 +1,42 @@
+import asyncio
+from fastapi import Depends, FastAPI, Form
+from fastapi.testclient import TestClient
+from ..ratelimits import RateLimit, SQLiteStore, consume
+
+
+def test_token_bucket_refill():
+    tokens, retry_after = consume(1, 0, 0, capacity=2, period=10)
+    assert (tokens, retry_after) == (0, 0)
+    tokens, retry_after = consume(tokens, 0, 0, capacity=2, period=10)
+    assert retry_after == 5
+    tokens, retry_after = consume(tokens, 0, 5, capacity=2, period=10)
+    assert retry_after == 0
+
+
+def test_sqlite_store_is_shared(tmp_path):
+    path = str(tmp_path / "ratelimits.sqlite3")
+    first, second = SQLiteStore(path), SQLiteStore(path)
+
+    async def take():
+        return [
+            await first.take("key", 2, 60),
+            await second.take("key", 2, 60),
+            await first.take("key", 2, 60),
+        ]
+
+    assert [retry_after > 0 for retry_after in asyncio.run(take())] == [False, False, True]
+
+
+def test_rate_limit_per_account():
+    app = FastAPI()
+
+    @app.post("/login/", dependencies=[Depends(RateLimit("test", ip=(10, 60), account=(1, 60)))])
+    async def login(username: str = Form(...)):
+        return {}
+
+    client = TestClient(app)
+    assert client.post("/login/", data={"username": "foo@example.com"}).status_code == 200
+    response = client.post("/login/", data={"username": "FOO@example.com"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) == 60
+    assert client.post("/login/", data={"username": "bar@example.com"}).status_code == 200
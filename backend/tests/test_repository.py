@@ -0,0 +1,44 @@
+import asyncio
+from datetime import datetime
+from ..crud import AsyncRepository
+from ..pagination import PageParams
+from ..routers.tickets.models import Ticket
+from ..routers.users.models import User
+
+
+def test_repository_round_trip(async_session):
+    tickets = AsyncRepository(Ticket, keys={"create_at": datetime, "id": int})
+    users = AsyncRepository(User)
+
+    async def run():
+        async with async_session.begin() as session:
+            created = await tickets.create_many(session, [
+                {"text": f"text {i}", "session_key": "test", "create_at": datetime(2023, 3, 1)}
+                for i in range(5)
+            ])
+            assert [ticket.text for ticket in created] == [f"text {i}" for i in range(5)]
+            assert [ticket.id for ticket in await tickets.get_many(session, [3, 9, 1])] == [3, 1]
+
+            # The tickets that share the create datetime are ordered by id.
+            ids, cursor = [], None
+            while True:
+                rows, cursor = await tickets.list(session, PageParams(cursor=cursor, limit=2))
+                ids += [ticket.id for ticket in rows]
+                if not cursor:
+                    break
+            assert ids == [1, 2, 3, 4, 5]
+
+            assert (await tickets.update(session, 2, {"text": "updated"})).text == "updated"
+            assert (await tickets.delete(session, 2)).id == 2
+            assert await tickets.get(session, 2) is None
+            assert await tickets.update(session, 2, {"text": "updated"}) is None
+
+        async with async_session.begin() as session:
+            values = {"username": "user", "email": "user@example.com", "hashed_password": "a"}
+            first, = await users.upsert(session, [values], index_elements=["username"])
+            second, = await users.upsert(
+                session, [{**values, "hashed_password": "b"}], index_elements=["username"]
+            )
+            assert (second.id, second.hashed_password) == (first.id, "b")
+
+    asyncio.run(run())
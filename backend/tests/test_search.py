@@ -0,0 +1,118 @@
+import asyncio
+import re
+import pytest
+from fastapi.testclient import TestClient
+from httpx import AsyncClient
+from sqlalchemy import create_engine, text
+from ..app import create_app
+from ..routers.tickets.views import search_debouncer
+from ..search import Debouncer, fts_query
+
+
+def test_fts_query_quotes_the_terms():
+    assert fts_query('fix "log-in" NEAR(') == '"fix"* "log"* "in"* "NEAR"*'
+    assert fts_query(' :: ') is None
+
+
+def test_debouncer_drops_the_superseded_requests():
+    debouncer = Debouncer(0.01)
+
+    async def keystrokes():
+        return await asyncio.gather(*(debouncer.wait("session") for _ in range(3)))
+
+    assert asyncio.run(keystrokes()) == [False, False, True]
+    assert debouncer.sequences == {}
+
+
+def test_search_index_follows_the_tickets(database):
+    engine = create_engine(f"sqlite:///{database}")
+
+    def search(query):
+        with engine.connect() as conn:
+            return conn.execute(
+                text("SELECT rowid FROM tickets_fts WHERE tickets_fts MATCH :query ORDER BY rank"),
+                {"query": query},
+            ).scalars().all()
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO tickets (text, description, session_key) "
+            "VALUES ('printer jam', 'office', 'a'), ('paper', 'printer is out of paper', 'a')"
+        ))
+    assert search('"print"*') == [1, 2]
+
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE tickets SET text = 'scanner' WHERE id = 1"))
+        conn.execute(text("DELETE FROM tickets WHERE id = 2"))
+    assert search('"print"*') == []
+    assert search('"scan"*') == [1]
+
+
+def test_search_view_debounces_only_by_the_session(override_sessions, monkeypatch):
+    monkeypatch.setattr(search_debouncer, "delay", 0.05)
+    app = override_sessions(create_app())
+
+    async def search(cookies):
+        async with AsyncClient(app=app, base_url="http://test", cookies=cookies) as client:
+            return sorted(
+                response.status_code
+                for response in await asyncio.gather(
+                    client.get("/ticket/search", params={"q": "print"}),
+                    client.get("/ticket/search", params={"q": "printer"}),
+                )
+            )
+
+    # The clients without the session cookie do not supersede each other.
+    assert asyncio.run(search({})) == [200, 200]
+    assert asyncio.run(search({"session_key": "a"})) == [200, 204]
+
+
+@pytest.fixture
+def client(database, override_sessions, monkeypatch) -> TestClient:
+    monkeypatch.setattr(search_debouncer, "delay", 0)
+    # The tickets of the same length that match the term once share the rank, and
+    # are ordered by id.
+    tickets = [(f"printer jam {i}", "a") for i in range(5)] + [
+        ("printer printer", "a"), ("scanner", "a"),
+        ("printer jam 5", "b"), ("laser printer toner cartridge", "b"),
+    ]
+    with create_engine(f"sqlite:///{database}").begin() as conn:
+        conn.execute(
+            text("INSERT INTO tickets (text, session_key) VALUES (:text, :session_key)"),
+            [{"text": ticket, "session_key": session_key} for ticket, session_key in tickets],
+        )
+    return TestClient(override_sessions(create_app()))
+
+
+def test_search_api_pages(client):
+    def ids(response):
+        assert response.status_code == 200
+        return [ticket["id"] for ticket in response.json()["items"]]
+
+    everything = ids(client.get("/api/v1/tickets/search", params={"q": "printer", "limit": 50}))
+    assert everything == [6, 1, 2, 3, 4, 5, 8, 9]
+
+    walked, cursor = [], None
+    while True:
+        params = {"q": "printer", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/tickets/search", params=params)
+        walked += ids(response)
+        if not (cursor := response.json()["next_cursor"]):
+            break
+    assert walked == everything
+
+    assert client.get("/api/v1/tickets/search", params={"q": ""}).status_code == 422
+    assert ids(client.get("/api/v1/tickets/search", params={"q": " :: "})) == []
+
+
+def test_search_view_fragments(client):
+    client.cookies.set("session_key", "a")
+
+    def texts(q):
+        response = client.get("/ticket/search", params={"q": q})
+        assert response.status_code == 200
+        return re.findall(r"<p>(.*?)</p>", response.text)[::2]
+
+    assert texts("printer") == ["printer printer"] + [f"printer jam {i}" for i in range(5)]
+    assert texts("scan") == ["scanner"]
+    assert texts(" ") == [f"printer jam {i}" for i in range(5)] + ["printer printer", "scanner"]
@@ -0,0 +1,37 @@
+import asyncio
+import multiprocessing
+from ..securities import PasswordService, get_password_hash
+
+
+def test_password_service_round_trip():
+    service = PasswordService(max_workers=2, concurrency=2)
+
+    async def main():
+        hashed_passwords = await asyncio.gather(*(service.hash(f"password{i}") for i in range(3)))
+        verified = await asyncio.gather(
+            service.verify("password0", hashed_passwords[0]),
+            service.verify("wrong", hashed_passwords[1]),
+        )
+        return hashed_passwords, verified
+
+    try:
+        hashed_passwords, verified = asyncio.run(main())
+    finally:
+        service.shutdown()
+    assert all(hashed.startswith("$2b$") for hashed in hashed_passwords)
+    assert verified == [True, False]
+    stats = service.stats()
+    assert stats["waiting"] == 0
+    assert stats["running"] == 0
+    assert stats["completed"] == 5
+    assert stats["max_waiting"] >= 1
+
+
+def test_password_service_spawns_without_forkserver(monkeypatch):
+    monkeypatch.setattr(multiprocessing, "get_all_start_methods", lambda: ["spawn"])
+    service = PasswordService(max_workers=1)
+    try:
+        assert asyncio.run(service.verify("password", get_password_hash("password")))
+        assert service.executor._mp_context.get_start_method() == "spawn"
+    finally:
+        service.shutdown()
@@ -0,0 +1,49 @@
+import asyncio
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from ..database import create_async_read_engine, read_only_url
+
+
+def test_read_only_url():
+    assert read_only_url("sqlite+aiosqlite:////tmp/db.sqlite3").render_as_string() == (
+        "sqlite+aiosqlite:///file:/tmp/db.sqlite3?mode=ro&uri=true"
+    )
+    assert read_only_url("sqlite+aiosqlite://").render_as_string() == "sqlite+aiosqlite://"
+    assert read_only_url("postgresql+asyncpg://user@replica/db").host == "replica"
+
+
+def test_read_only_engine_sees_writes_and_rejects_them(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite3'}"
+    engine = create_async_engine(url)
+    read_engine = create_async_engine(read_only_url(url))
+
+    async def run():
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE tickets (id INTEGER PRIMARY KEY)"))
+            await conn.execute(text("INSERT INTO tickets (id) VALUES (1)"))
+        async with read_engine.connect() as conn:
+            assert (await conn.execute(text("SELECT COUNT(*) FROM tickets"))).scalar() == 1
+            with pytest.raises(OperationalError, match="readonly"):
+                await conn.execute(text("INSERT INTO tickets (id) VALUES (2)"))
+        await read_engine.dispose()
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_read_engine_of_in_memory_database_is_the_primary_engine():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    assert create_async_read_engine(engine) is engine
+    read_engine = create_async_read_engine(create_async_engine("sqlite+aiosqlite:////tmp/db.sqlite3"))
+    assert read_engine.url.query == {"mode": "ro", "uri": "true"}
+
+    async def run():
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE tickets (id INTEGER PRIMARY KEY)"))
+        async with create_async_read_engine(engine).connect() as conn:
+            assert (await conn.execute(text("SELECT COUNT(*) FROM tickets"))).scalar() == 0
+        await engine.dispose()
+
+    asyncio.run(run())
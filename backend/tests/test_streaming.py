@@ -0,0 +1,29 @@
+import asyncio
+import json
+from pydantic import BaseModel
+from ..streaming import json_array, ndjson
+
+
+class Item(BaseModel):
+    id: int
+
+
+async def batches(*sizes):
+    start = 0
+    for size in sizes:
+        yield [Item(id=i) for i in range(start, start + size)]
+        start += size
+
+
+async def collect(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+def test_json_array_is_valid_across_batches():
+    assert json.loads(asyncio.run(collect(json_array(batches(2, 0, 3))))) == [{"id": i} for i in range(5)]
+    assert json.loads(asyncio.run(collect(json_array(batches())))) == []
+
+
+def test_ndjson_writes_one_row_per_line():
+    lines = asyncio.run(collect(ndjson(batches(2, 1)))).decode().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [0, 1, 2]
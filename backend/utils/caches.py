@@ -0,0 +1,149 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+# The default value of `get` for the caches that keep the None values.
+MISSING = object()
+
+
+class LRUCache(Generic[KeyType, ValueType]):
+    """Bounded in-process cache that evicts the least recently used entry when it
+    is full, and keeps the hit and miss counters for reporting.
+
+    usages:
+
+        ..> cache = LRUCache(maxsize=1024)
+        ... cache.set('key', 'value')
+        ... cache.get('key')
+        'value'
+        ... cache.stats()
+        {'size': 1, 'maxsize': 1024, 'hits': 1, 'misses': 0, ...}
+
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: KeyType) -> bool:
+        return key in self._data
+
+    def get(self, key: KeyType, default: Optional[ValueType] = None) -> Optional[ValueType]:
+        with self._lock:
+            value = self._data.get(key, MISSING)
+            if value is MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: KeyType, value: ValueType) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: KeyType, default: Optional[ValueType] = None) -> Optional[ValueType]:
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def pop_if(self, predicate: Callable[[KeyType, ValueType], bool]) -> int:
+        """Remove the entries that match the predicate and return their count"""
+        with self._lock:
+            keys = [key for key, entry in self._data.items() if predicate(key, self._unwrap(entry))]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+
+    @staticmethod
+    def _unwrap(entry: Any) -> ValueType:
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        requests = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / requests, 4) if requests else 0.0,
+        }
+
+
+class TTLCache(LRUCache[KeyType, ValueType]):
+    """Bounded LRU cache that expires every entry at its own time. The expire time
+    is the `ttl` seconds after setting, or the absolute `expire_at` timestamp like
+    the `exp` claim of JWT.
+
+    usages:
+
+        ..> cache = TTLCache(maxsize=1024, ttl=30)
+        ... cache.set('key', 'value')
+        ... cache.set('token', claims, expire_at=claims['exp'])
+
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0) -> None:
+        super().__init__(maxsize=maxsize)
+        self.ttl: float = ttl
+        self.expirations: int = 0
+
+    def get(self, key: KeyType, default: Optional[ValueType] = None) -> Optional[ValueType]:
+        with self._lock:
+            entry = self._data.get(key, MISSING)
+            if entry is MISSING:
+                self.misses += 1
+                return default
+            expire_at, value = entry
+            if expire_at <= time.time():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(
+            self,
+            key: KeyType,
+            value: ValueType,
+            *,
+            ttl: Optional[float] = None,
+            expire_at: Optional[float] = None,
+    ) -> None:
+        if expire_at is None:
+            expire_at = time.time() + (self.ttl if ttl is None else ttl)
+        super().set(key, (expire_at, value))
+
+    def pop(self, key: KeyType, default: Optional[ValueType] = None) -> Optional[ValueType]:
+        entry = super().pop(key, MISSING)
+        return default if entry is MISSING else entry[1]
+
+    @staticmethod
+    def _unwrap(entry: Any) -> ValueType:
+        return entry[1]
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "expirations": self.expirations}
@@ -0,0 +1,277 @@
+import asyncio
+import logging
+import random
+import smtplib
+import time
+from email.message import EmailMessage
+from email.utils import formataddr, make_msgid
+from typing import Any, Dict, List, Optional, Tuple
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def build_message(email_to: str, subject: str, html: str) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = subject
+    message["From"] = formataddr((settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL))
+    message["To"] = email_to
+    message["Message-ID"] = make_msgid()
+    message.set_content(html, subtype="html")
+    return message
+
+
+def is_transient(exc: Exception) -> bool:
+    """Return True if the delivery may succeed later, like the dropped connection
+    or the `4xx` reply, and False for the permanent `5xx` reply.
+    """
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in exc.recipients.values())
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    return isinstance(exc, (smtplib.SMTPException, OSError))
+
+
+class MailQueue:
+    """Outbound mail queue with a long-lived worker task. The worker sends the
+    queued messages in batches over one reused SMTP connection in a thread, and
+    retries the transient failures with the exponential backoff. The retry is
+    queued again when its backoff expires, so the worker keeps sending the other
+    messages in the meantime. The number of messages that wait for, or are in, the
+    delivery is capped by `max_in_flight`, and the message over the cap is dropped
+    instead of blocking the request.
+
+    usages:
+
+        ..> await mail_queue.start()
+        ... mail_queue.submit(build_message('to@example.com', 'Subject', '<p>Hello</p>'))
+        ... await mail_queue.stop()
+
+    """
+
+    def __init__(
+            self,
+            host: Optional[str],
+            port: int = 25,
+            *,
+            tls: bool = False,
+            user: Optional[str] = None,
+            password: Optional[str] = None,
+            timeout: float = 10.0,
+            batch_size: int = 50,
+            max_in_flight: int = 1000,
+            max_retries: int = 5,
+            backoff: float = 1.0,
+            backoff_max: float = 60.0,
+            idle_timeout: float = 30.0,
+    ) -> None:
+        self.host: Optional[str] = host
+        self.port: int = port
+        self.tls: bool = tls
+        self.user: Optional[str] = user
+        self.password: Optional[str] = password
+        self.timeout: float = timeout
+        self.batch_size: int = batch_size
+        self.max_in_flight: int = max_in_flight
+        self.max_retries: int = max_retries
+        self.backoff: float = backoff
+        self.backoff_max: float = backoff_max
+        self.idle_timeout: float = idle_timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        # The timers of the retries that wait for their backoff, by the id of the
+        # message. The retry keeps its unfinished task of the queue until it is
+        # queued again, so `join` waits for it too.
+        self._retries: Dict[int, asyncio.TimerHandle] = {}
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._used_at: float = 0.0
+        self.sent: int = 0
+        self.failed: int = 0
+        self.retried: int = 0
+        self.dropped: int = 0
+        self.connections: int = 0
+
+    async def start(self) -> None:
+        if self._worker is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Deliver the queued messages for up to `timeout` seconds, then stop the
+        worker and close the SMTP connection.
+        """
+        if self._worker is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            undelivered = self._queue.qsize() + len(self._retries)
+            logger.warning(f"mail queue stopped with {undelivered} undelivered messages")
+        for handle in self._retries.values():
+            handle.cancel()
+        self._retries.clear()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        await asyncio.to_thread(self._close)
+        self._worker = None
+        self._loop = None
+
+    def submit(self, message: EmailMessage) -> None:
+        """Queue the message without waiting for the delivery. It is safe to call
+        from the event loop and from the threads of the threadpool. The message that
+        is submitted before the queue is started, or after it is stopped, is dropped,
+        because the caller has already committed the change that it reports.
+        """
+        if self._loop is None:
+            self.dropped += 1
+            logger.error(f"mail queue is not started, dropped email to {message['To']}")
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._put(message)
+        else:
+            self._loop.call_soon_threadsafe(self._put, message)
+
+    async def join(self) -> None:
+        """Wait until every queued message is delivered or failed"""
+        await self._queue.join()
+
+    def _put(self, message: EmailMessage) -> None:
+        if not self.host:
+            self.dropped += 1
+            logger.warning(f"SMTP host is not configured, dropped email to {message['To']}")
+            return
+        if self._queue.qsize() + len(self._retries) >= self.max_in_flight:
+            self.dropped += 1
+            logger.error(f"mail queue is full, dropped email to {message['To']}")
+            return
+        self._queue.put_nowait((message, 0))
+
+    async def _run(self) -> None:
+        while True:
+            batch: List[Tuple[EmailMessage, int]] = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            retried = 0
+            try:
+                retried = await self._deliver(batch)
+            except Exception:
+                logger.exception("mail queue worker failed to deliver the batch")
+            finally:
+                for _ in range(len(batch) - retried):
+                    self._queue.task_done()
+
+    async def _deliver(self, batch: List[Tuple[EmailMessage, int]]) -> int:
+        """Send the batch and schedule the retries of the transient failures, and
+        return the number of the retries.
+        """
+        retried = 0
+        for message, attempts, exc in await asyncio.to_thread(self._send, batch):
+            if not is_transient(exc) or attempts >= self.max_retries:
+                self.failed += 1
+                logger.error(f"failed to send email to {message['To']}: {exc!r}")
+            else:
+                self._retry(message, attempts + 1)
+                retried += 1
+        return retried
+
+    def _retry(self, message: EmailMessage, attempts: int) -> None:
+        """Queue the message again after the backoff, instead of sleeping in the
+        worker, which would hold the other queued messages behind the retry.
+        """
+        self.retried += 1
+        delay = min(self.backoff_max, self.backoff * 2 ** (attempts - 1)) * random.uniform(0.5, 1.0)
+        self._retries[id(message)] = self._loop.call_later(delay, self._requeue, message, attempts)
+
+    def _requeue(self, message: EmailMessage, attempts: int) -> None:
+        del self._retries[id(message)]
+        self._queue.put_nowait((message, attempts))
+        # Release the unfinished task of the previous attempt.
+        self._queue.task_done()
+
+    def _send(self, batch: List[Tuple[EmailMessage, int]]) -> List[Tuple[EmailMessage, int, Exception]]:
+        """Send the batch over the SMTP connection, and return the failed messages
+        with their exceptions. The connection is dropped after the connection error,
+        so the retry opens a new one.
+        """
+        try:
+            smtp = self._connection()
+        except (smtplib.SMTPException, OSError) as exc:
+            return [(message, attempts, exc) for message, attempts in batch]
+
+        failures = []
+        for index, (message, attempts) in enumerate(batch):
+            try:
+                smtp.send_message(message)
+                self._used_at = time.monotonic()
+                self.sent += 1
+            except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused) as exc:
+                failures.append((message, attempts, exc))
+            except (smtplib.SMTPException, OSError) as exc:
+                self._close()
+                failures.extend((message, attempts, exc) for message, attempts in batch[index:])
+                break
+        return failures
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._smtp is not None and time.monotonic() - self._used_at > self.idle_timeout:
+            # The server may have closed the idle connection already.
+            self._close()
+        if self._smtp is None:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            try:
+                if self.tls:
+                    smtp.starttls()
+                if self.user:
+                    smtp.login(self.user, self.password or "")
+            except BaseException:
+                smtp.close()
+                raise
+            self._smtp = smtp
+            self._used_at = time.monotonic()
+            self.connections += 1
+        return self._smtp
+
+    def _close(self) -> None:
+        if self._smtp is None:
+            return
+        smtp, self._smtp = self._smtp, None
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            smtp.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_in_flight": self.max_in_flight,
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "dropped": self.dropped,
+            "connections": self.connections,
+        }
+
+
+mail_queue: MailQueue = MailQueue(
+    settings.SMTP_HOST,
+    settings.SMTP_PORT,
+    tls=settings.SMTP_TLS,
+    user=settings.SMTP_USER,
+    password=settings.SMTP_PASSWORD,
+    timeout=settings.SMTP_TIMEOUT,
+    batch_size=settings.MAIL_BATCH_SIZE,
+    max_in_flight=settings.MAIL_MAX_IN_FLIGHT,
+    max_retries=settings.MAIL_MAX_RETRIES,
+    backoff=settings.MAIL_RETRY_BACKOFF,
+)
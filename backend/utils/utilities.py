@@ -1,51 +1,35 @@
 import logging
 from datetime import datetime, timedelta
-from pathlib import Path
 from typing import Any, Dict, Optional
-import emails
 from datetime import timezone
-from emails.template import JinjaTemplate
 from jose import jwt
 from ..config import settings
+from ..templating import get_email_templates
+from .mailer import build_message, mail_queue
 
 
 def send_email(
     email_to: str,
-    subject_template: Optional[str] = None,
-    html_template: Optional[str] = "",
+    subject: str,
+    template_name: str,
     environment: Optional[Dict[str, Any]] = None,
 ) -> None:
+    """Render the email from the compiled template and queue it to the outbound
+    mail queue. It returns at once, and the worker of the queue sends the email.
+    """
     assert settings.EMAILS_ENABLED, "no provided configuration for email variables"
-    subject_template = subject_template or ""
-    html_template = html_template or ""
-    environment = environment or {}
-    message = emails.Message(
-        subject=JinjaTemplate(subject_template),
-        html=JinjaTemplate(html_template),
-        mail_from=(settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL),
-    )
-    smtp_options = {"host": settings.SMTP_HOST, "port": settings.SMTP_PORT}
-    if settings.SMTP_TLS:
-        smtp_options["tls"] = True
-    if settings.SMTP_USER:
-        smtp_options["user"] = settings.SMTP_USER
-    if settings.SMTP_PASSWORD:
-        smtp_options["password"] = settings.SMTP_PASSWORD
-    response = message.send(to=email_to, render=environment, smtp=smtp_options)
-    print(f"send email result: {response}")
-    logging.info(f"send email result: {response}")
+    html = get_email_templates().render(template_name, **(environment or {}))
+    mail_queue.submit(build_message(email_to, subject=subject, html=html))
+    logging.info(f"queued email to {email_to}")
 
 
 def send_test_email(email_to: str) -> None:
     project_name = settings.PROJECT_NAME
     subject = f"{project_name} - Test email"
-    template_str = Path(
-        Path(settings.EMAIL_TEMPLATES_DIR) / "test_email.html"
-    ).read_text()
     send_email(
         email_to=email_to,
-        subject_template=subject,
-        html_template=template_str,
+        subject=subject,
+        template_name="test_email.html",
         environment={"project_name": settings.PROJECT_NAME, "email": email_to},
     )
 
@@ -53,16 +37,12 @@ def send_test_email(email_to: str) -> None:
 def send_reset_password_email(email_to: str, email: str, token: str) -> None:
     project_name = settings.PROJECT_NAME
     subject = f"{project_name} - Password recovery for user {email}"
-    template_str = Path(
-        Path(settings.EMAIL_TEMPLATES_DIR) / "reset_password.html"
-    ).read_text()
-
     server_host = settings.SERVER_HOST
     link = f"{server_host}/reset-password?token={token}"
     send_email(
         email_to=email_to,
-        subject_template=subject,
-        html_template=template_str,
+        subject=subject,
+        template_name="reset_password.html",
         environment={
             "project_name": settings.PROJECT_NAME,
             "username": email,
@@ -76,15 +56,11 @@ def send_reset_password_email(email_to: str, email: str, token: str) -> None:
 def send_new_account_email(email_to: str, username: str, password: str) -> None:
     project_name = settings.PROJECT_NAME
     subject = f"{project_name} - New account for user {username}"
-    template_str = Path(
-        Path(settings.EMAIL_TEMPLATES_DIR) / "new_account.html"
-    ).read_text()
-
     link = settings.SERVER_HOST
     send_email(
         email_to=email_to,
-        subject_template=subject,
-        html_template=template_str,
+        subject=subject,
+        template_name="new_account.html",
         environment={
             "project_name": settings.PROJECT_NAME,
             "username": username,
@@ -0,0 +1,80 @@
+"""Benchmark the latency per call of the ticket services with the statement that
+is built for every call (the previous `Ticket.read_by_id`) and with the cached
+lambda statements of `AsyncRepository`, that also serve the keyset pages.
+
+usages:
+
+    ..> $ python -m benchmarks.bench_repository --tickets 1000 --calls 5000
+
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from backend.migrations import migrate
+from backend.pagination import PageParams, encode_cursor
+from backend.routers.tickets.crud import tickets_repository
+from backend.routers.tickets.models import Ticket
+
+
+async def measure(
+        async_session: async_sessionmaker,
+        call: Callable[[AsyncSession, int], Awaitable],
+        calls: int,
+        tickets: int,
+) -> List[float]:
+    timings: List[float] = []
+    for i in range(calls):
+        # A new session for every call, like the services, so the identity map
+        # does not answer the reads.
+        started = time.perf_counter()
+        async with async_session.begin() as session:
+            await call(session, i % tickets + 1)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def run(path: Path, tickets: int, calls: int) -> None:
+    migrate(create_engine(f"sqlite:///{path}"), path.with_suffix(".lock"))
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async_session = async_sessionmaker(engine, expire_on_commit=False)
+    async with async_session.begin() as session:
+        rows = await tickets_repository.create_many(session, [
+            {"text": f"text {i}", "session_key": "bench"} for i in range(tickets)
+        ])
+    cursors = {row.id: encode_cursor(row.create_at, row.id) for row in rows}
+
+    cases = {
+        "get per-call": lambda session, id: Ticket.read_by_id(session, id),
+        "get repository": lambda session, id: tickets_repository.get(session, id),
+        "list repository": lambda session, id: tickets_repository.list(
+            session, PageParams(cursor=cursors[id], limit=20)
+        ),
+    }
+    for name, call in cases.items():
+        # Warm up the statement caches and the connection pool.
+        await measure(async_session, call, 100, tickets)
+        timings = sorted(await measure(async_session, call, calls, tickets))
+        print(
+            f"{name:<16} mean={statistics.mean(timings) * 1000:.3f}ms "
+            f"p99={timings[int(len(timings) * 0.99)] * 1000:.3f}ms"
+        )
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickets", type=int, default=1000)
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(run(Path(directory) / "bench.sqlite3", args.tickets, args.calls))
+
+
+if __name__ == '__main__':
+    main()
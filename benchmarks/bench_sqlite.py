@@ -0,0 +1,99 @@
+"""Benchmark the read and write throughput of SQLite under concurrency with the
+default pragmas and with the SQLite profile of `SQLALCHEMY_SQLITE_PRAGMAS`.
+
+usages:
+
+    ..> $ python -m benchmarks.bench_sqlite --writers 4 --readers 8 --seconds 5
+
+"""
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from backend.database import set_sqlite_pragmas
+
+
+def run(path: Path, *, profile: bool, writers: int, readers: int, seconds: float) -> Dict[str, int]:
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False, "timeout": 5},
+        pool_size=writers + readers,
+    )
+    if profile:
+        event.listen(engine, "connect", set_sqlite_pragmas)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE tickets (id INTEGER PRIMARY KEY, text TEXT, session_key TEXT)"
+        )
+
+    counters = {"writes": 0, "reads": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def count(name: str) -> None:
+        with lock:
+            counters[name] += 1
+
+    def write(index: int) -> None:
+        while time.perf_counter() < deadline:
+            try:
+                with engine.begin() as conn:
+                    conn.exec_driver_sql(
+                        "INSERT INTO tickets (text, session_key) VALUES (?, ?)",
+                        (f"text {index}", f"session {index}"),
+                    )
+                count("writes")
+            except OperationalError:
+                count("errors")
+
+    def read(index: int) -> None:
+        while time.perf_counter() < deadline:
+            try:
+                with engine.connect() as conn:
+                    conn.exec_driver_sql(
+                        "SELECT id, text FROM tickets WHERE session_key = ? ORDER BY id DESC LIMIT 20",
+                        (f"session {index % writers}", ),
+                    ).all()
+                count("reads")
+            except OperationalError:
+                count("errors")
+
+    threads = [threading.Thread(target=write, args=(i, )) for i in range(writers)]
+    threads += [threading.Thread(target=read, args=(i, )) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return counters
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    for name, profile in (("default", False), ("profile", True)):
+        with tempfile.TemporaryDirectory() as directory:
+            counters = run(
+                Path(directory) / "bench.sqlite3",
+                profile=profile,
+                writers=args.writers,
+                readers=args.readers,
+                seconds=args.seconds,
+            )
+        print(
+            f"{name:<8} writes/s={counters['writes'] / args.seconds:.0f} "
+            f"reads/s={counters['reads'] / args.seconds:.0f} "
+            f"errors={counters['errors']}"
+        )
+
+
+if __name__ == '__main__':
+    main()
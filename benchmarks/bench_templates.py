@@ -0,0 +1,95 @@
+"""Benchmark the render latency of the ticket page with a new Jinja2 environment per
+request (the previous behavior of `get_templates`) and with the process-wide
+template engine.
+
+usages:
+
+    ..> $ python -m benchmarks.bench_templates --tickets 50 --rounds 200
+
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from typing import Callable, List
+from fastapi import Request
+from fastapi.templating import Jinja2Templates
+from backend.app import create_app
+from backend.config import settings
+from backend.templating import TemplateEngine
+from backend.routers.tickets.schemas import Ticket as SchemaTicket
+
+
+def make_request(app) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "app": app,
+            "router": app.router,
+            "method": "GET",
+            "scheme": "http",
+            "server": ("localhost", 8000),
+            "root_path": "",
+            "path": "/ticket/",
+            "query_string": b"",
+            "headers": [],
+        }
+    )
+
+
+def per_request_templates() -> Jinja2Templates:
+    return Jinja2Templates(
+        directory=settings.TEMPLATES_DIR,
+        autoescape=True,
+        lstrip_blocks=True,
+    )
+
+
+def measure(factory: Callable[[], Jinja2Templates], context: dict, rounds: int) -> List[float]:
+    timings: List[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        factory().get_template("tickets/index.html").render(context)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(name: str, timings: List[float]) -> None:
+    timings = sorted(timings)
+    print(
+        f"{name:<12} mean={statistics.mean(timings):.3f}ms "
+        f"p50={timings[len(timings) // 2]:.3f}ms "
+        f"p95={timings[int(len(timings) * 0.95)]:.3f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tickets", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    context = {
+        "request": make_request(create_app()),
+        "tickets": [
+            SchemaTicket(id=i, text=f"text {i}", description=f"description {i}", session_key="bench")
+            for i in range(1, args.tickets + 1)
+        ],
+        "title": "Home",
+    }
+    report("before", measure(per_request_templates, context, args.rounds))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # A cold worker that loads the bytecode cache from the previous worker.
+        TemplateEngine(settings.TEMPLATES_DIR, bytecode_cache_dir=cache_dir).precompile()
+        engine = TemplateEngine(
+            settings.TEMPLATES_DIR, auto_reload=False, bytecode_cache_dir=cache_dir
+        )
+        start = time.perf_counter()
+        engine.precompile()
+        print(f"{'warm start':<12} precompile={(time.perf_counter() - start) * 1000:.3f}ms")
+        report("after", measure(lambda: engine.templates, context, args.rounds))
+
+
+if __name__ == '__main__':
+    main()